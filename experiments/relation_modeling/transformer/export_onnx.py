@@ -0,0 +1,46 @@
+import argparse
+import csv
+import os
+
+from kogito.core.processors.relation import (
+    BERTRelationMatcher,
+    DistilBERTRelationMatcher,
+    relation_matcher_parity,
+)
+
+MATCHERS = {"distilbert": DistilBERTRelationMatcher, "bert": BERTRelationMatcher}
+EXAMPLE_HEADS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "..",
+    "..",
+    "examples",
+    "sample_graph.tsv",
+)
+
+
+def load_example_heads(path):
+    with open(path) as f:
+        return sorted({row[0] for row in csv.reader(f, delimiter="\t") if row})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export a relation classifier to ONNX and check parity"
+    )
+    parser.add_argument("--model", choices=list(MATCHERS), default="distilbert")
+    parser.add_argument("--output", default="models/relation_classifier.onnx")
+    parser.add_argument("--quantize", action="store_true")
+    parser.add_argument("--heads", default=EXAMPLE_HEADS_PATH)
+    args = parser.parse_args()
+
+    matcher_class = MATCHERS[args.model]
+    reference = matcher_class(f"{args.model}_relation_matcher")
+    reference.export_onnx(args.output, quantize=args.quantize)
+    exported = matcher_class(
+        f"{args.model}_onnx_relation_matcher", onnx_path=args.output
+    )
+
+    heads = load_example_heads(args.heads)
+    parity = relation_matcher_parity(reference, exported, heads)
+    print(f"Checked {len(heads)} heads: {parity}")
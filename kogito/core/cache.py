@@ -0,0 +1,265 @@
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import sqlite3
+import time
+
+from kogito.core.knowledge import Knowledge, KnowledgeGraph
+from kogito.core.model import KnowledgeModel
+
+
+class GenerationCache:
+    """
+    Persistent on-disk cache of generated knowledge tails backed by SQLite.
+    """
+
+    def __init__(
+        self, path: str = "kogito_cache.sqlite", max_entries: Optional[int] = None
+    ) -> None:
+        """Initialize a generation cache
+
+        Args:
+            path (str, optional): Path to the cache database file. Defaults to "kogito_cache.sqlite".
+            max_entries (Optional[int], optional): Maximum number of entries to keep.
+                Least recently used entries are evicted once this size is exceeded.
+                Defaults to None (unbounded).
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS generations "
+            "(key TEXT PRIMARY KEY, tails TEXT NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS generations_accessed ON generations (accessed)"
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics
+
+        Returns:
+            Dict[str, int]: Number of hits, misses and entries
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[str]]:
+        """Look up multiple keys at once and update hit/miss counters
+
+        Args:
+            keys (List[str]): Cache keys
+
+        Returns:
+            Dict[str, List[str]]: Cached tails for the keys found in the cache
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        # Stay below SQLite's default limit on query parameters
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start : start + 500]
+            rows = self._conn.execute(
+                f"SELECT key, tails FROM generations WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            found.update({key: json.loads(tails) for key, tails in rows})
+
+        if found:
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE generations SET accessed = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+            self._conn.commit()
+
+        hits = sum(1 for key in keys if key in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+
+        return found
+
+    def set_many(self, items: List[Tuple[str, List[str]]]) -> None:
+        """Store multiple entries at once and evict old entries if needed
+
+        Args:
+            items (List[Tuple[str, List[str]]]): List of (key, tails) pairs
+        """
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO generations (key, tails, accessed) VALUES (?, ?, ?)",
+            [(key, json.dumps(tails), now) for key, tails in items],
+        )
+        self.evict()
+        self._conn.commit()
+
+    def evict(self) -> None:
+        """Evict least recently used entries beyond ``max_entries``"""
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM generations WHERE key IN "
+                "(SELECT key FROM generations ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters"""
+        self._conn.execute("DELETE FROM generations")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self._conn.close()
+
+
+class CachedKnowledgeModel(KnowledgeModel):
+    """
+    Knowledge model wrapper that serves generations from a persistent cache.
+    Only the knowledge missing from the cache is sent to the wrapped model.
+    """
+
+    def __init__(
+        self,
+        model: KnowledgeModel,
+        cache: GenerationCache,
+        model_id: Optional[str] = None,
+    ) -> None:
+        """Initialize a cached knowledge model
+
+        Args:
+            model (KnowledgeModel): Knowledge model to wrap.
+            cache (GenerationCache): Cache to use.
+            model_id (Optional[str], optional): Identifier of the model used in cache keys.
+                If omitted, it is derived from the model class and its model name or path.
+                Defaults to None.
+        """
+        self.model = model
+        self.cache = cache
+        self.model_id = model_id or model_identity(model)
+
+    def train(self, *args, **kwargs) -> KnowledgeModel:
+        return self.model.train(*args, **kwargs)
+
+    def save_pretrained(self, save_path: str) -> None:
+        self.model.save_pretrained(save_path)
+
+    @classmethod
+    def from_pretrained(cls, model_name_or_path: str) -> KnowledgeModel:
+        raise ValueError("Cached model should be created by wrapping a loaded model")
+
+    def generate(self, input_graph: KnowledgeGraph, *args, **kwargs) -> KnowledgeGraph:
+        """Generate inferences, only querying the wrapped model for cache misses.
+        Knowledge with tails (e.g. GPT-3 samples) is passed to the wrapped model along with the misses
+        and is part of the cache key, but it is neither cached nor included in the output, whether or not
+        the cache is warm. Arguments are passed to the wrapped model's ``generate`` method.
+
+        Args:
+            input_graph (KnowledgeGraph): Input dataset
+
+        Returns:
+            KnowledgeGraph: Completed knowledge graph in input order
+        """
+        input_kgs = list(input_graph)
+        samples = [kg for kg in input_kgs if kg.tails]
+        sample_digest = _digest([kg.to_json() for kg in samples])
+        keys = [
+            (
+                None
+                if kg.tails
+                else self._key(
+                    kg, sample_digest=sample_digest, args=args, kwargs=kwargs
+                )
+            )
+            for kg in input_kgs
+        ]
+        cached = self.cache.get_many([key for key in keys if key is not None])
+        generated = {}
+
+        missing_kgs = [
+            kg
+            for kg, key in zip(input_kgs, keys)
+            if key is not None and key not in cached
+        ]
+
+        if missing_kgs:
+            # samples follow the misses, so the first output of a head-relation pair is the generated one
+            output_graph = self.model.generate(
+                KnowledgeGraph(missing_kgs + samples), *args, **kwargs
+            )
+            for kg in output_graph:
+                generated.setdefault((kg.head, kg.relation), kg.tails)
+            self.cache.set_many(
+                [
+                    (key, generated[(kg.head, kg.relation)])
+                    for kg, key in zip(input_kgs, keys)
+                    if key is not None
+                    and key not in cached
+                    and (kg.head, kg.relation) in generated
+                ]
+            )
+
+        outputs = []
+
+        for kg, key in zip(input_kgs, keys):
+            if key is None:
+                continue
+            if key in cached:
+                tails = cached[key]
+            elif (kg.head, kg.relation) in generated:
+                tails = generated[(kg.head, kg.relation)]
+            else:
+                continue
+            output_kg = kg.copy()
+            output_kg.tails = list(tails)
+            outputs.append(output_kg)
+
+        return KnowledgeGraph(outputs)
+
+    def _key(
+        self,
+        kg: Knowledge,
+        sample_digest: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> str:
+        return _digest(
+            {
+                "model": self.model_id,
+                "query": kg.to_query(),
+                "relation_type": kg.relation.type.value,
+                "samples": sample_digest,
+                "args": args,
+                "kwargs": kwargs,
+            }
+        )
+
+
+def model_identity(model: KnowledgeModel) -> str:
+    """Derive an identifier for a knowledge model from its class and model name or path
+
+    Args:
+        model (KnowledgeModel): Knowledge model
+
+    Returns:
+        str: Model identifier
+    """
+    name = getattr(model, "model_name", None)
+
+    if name is None:
+        name = getattr(getattr(model, "model", None), "name_or_path", None)
+
+    return f"{type(model).__name__}:{name}"
+
+
+def _digest(obj: Any) -> str:
+    return hashlib.sha256(
+        json.dumps(obj, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
@@ -1,4 +1,5 @@
-from typing import List, Union, Optional
+from typing import Dict, Iterable, Iterator, List, Union, Optional
+from array import array
 import pandas as pd
 import json
 
@@ -180,19 +181,51 @@ class KnowledgeGraph:
         Returns:
             KnowledgeGraph: An instance of KnowledgeGraph
         """
-        kg_list = []
+        return cls(
+            list(
+                cls.iter_jsonl(
+                    filepath,
+                    head_attr=head_attr,
+                    relation_attr=relation_attr,
+                    tails_attr=tails_attr,
+                    relation_type=relation_type,
+                )
+            )
+        )
+
+    @staticmethod
+    def iter_jsonl(
+        filepath: str,
+        head_attr: str = "head",
+        relation_attr: str = "relation",
+        tails_attr: str = "tails",
+        relation_type: KnowledgeRelationType = KnowledgeRelationType.ATOMIC,
+    ) -> Iterator[Knowledge]:
+        """Read knowledge from json file one line at a time.
+
+        Args:
+            filepath (str): Path to the graph file.
+            head_attr (str, optional): JSON attribute for head. Defaults to "head".
+            relation_attr (str, optional): JSON attribute for relation. Defaults to "relation".
+            tails_attr (str, optional): JSON attribute for tails. Defaults to "tails".
+            relation_type (KnowledgeRelationType, optional): Type of relation to use.
+                                                            Defaults to KnowledgeRelationType.ATOMIC.
+
+        Yields:
+            Knowledge: Knowledge instance for each line in the file
+        """
+        relations = _RelationCache(relation_type)
 
         with open(filepath) as file:
             for line in file:
+                if not line.strip():
+                    continue
                 kg_json = json.loads(line)
-                head = kg_json.get(head_attr)
-                relation = KnowledgeRelation.from_text(
-                    kg_json.get(relation_attr), relation_type
+                yield Knowledge(
+                    head=kg_json.get(head_attr),
+                    relation=relations[kg_json.get(relation_attr)],
+                    tails=kg_json.get(tails_attr),
                 )
-                tails = kg_json.get(tails_attr)
-                kg_list.append(Knowledge(head=head, relation=relation, tails=tails))
-
-        return cls(kg_list)
 
     @classmethod
     def from_csv(
@@ -220,18 +253,58 @@ class KnowledgeGraph:
         Returns:
             KnowledgeGraph: An instance of KnowledgeGraph
         """
-        kg_list = []
         graph_df = pd.read_csv(
-            filepath, sep=sep, header=header, names=[head_col, relation_col, tails_col]
+            filepath,
+            sep=sep,
+            header=_csv_header(header),
+            names=[head_col, relation_col, tails_col],
+        )
+        return cls(
+            _knowledge_from_columns(
+                graph_df, head_col, relation_col, tails_col, relation_type
+            )
         )
 
-        for _, row in graph_df.iterrows():
-            head = row[head_col]
-            relation = KnowledgeRelation.from_text(row[relation_col], relation_type)
-            tails = row[tails_col]
-            kg_list.append(Knowledge(head=head, relation=relation, tails=tails))
+    @staticmethod
+    def iter_csv(
+        filepath: str,
+        header: bool = True,
+        head_col: str = "head",
+        relation_col: str = "relation",
+        tails_col: str = "tails",
+        sep: str = ",",
+        relation_type: KnowledgeRelationType = KnowledgeRelationType.ATOMIC,
+        chunksize: int = 10000,
+    ) -> Iterator[Knowledge]:
+        """Read knowledge from csv file one chunk of rows at a time.
 
-        return cls(kg_list)
+        Args:
+            filepath (str): Path to the graph file.
+            header (bool, optional): Whether to look for header. Defaults to True.
+            head_col (str, optional): Head column name. Defaults to "head".
+            relation_col (str, optional): Relation column name. Defaults to "relation".
+            tails_col (str, optional): Tails column name. Defaults to "tails".
+            sep (str, optional): Delimiter to use. Defaults to ",".
+            relation_type (KnowledgeRelationType, optional): Relation type to use.
+                                                            Defaults to KnowledgeRelationType.ATOMIC.
+            chunksize (int, optional): Number of rows to read at once. Defaults to 10000.
+
+        Yields:
+            Knowledge: Knowledge instance for each row in the file
+        """
+        relations = _RelationCache(relation_type)
+
+        with pd.read_csv(
+            filepath,
+            sep=sep,
+            header=_csv_header(header),
+            names=[head_col, relation_col, tails_col],
+            chunksize=chunksize,
+        ) as reader:
+            for chunk_df in reader:
+                yield from _knowledge_from_columns(
+                    chunk_df, head_col, relation_col, tails_col, relations=relations
+                )
 
     def to_jsonl(self, filepath: str) -> None:
         """Write knowledge graph to a json file
@@ -239,11 +312,29 @@ class KnowledgeGraph:
         Args:
             filepath (str): JSON file path
         """
-        with open(filepath, "w") as file:
-            lines = []
-            for kg in self.graph:
-                lines.append(json.dumps(kg.to_json()))
-            file.writelines("\n".join(lines))
+        self.write_jsonl(self.graph, filepath)
+
+    @staticmethod
+    def write_jsonl(graph: Iterable[Knowledge], filepath: str, mode: str = "w") -> int:
+        """Write knowledge to a json file one line at a time.
+        Accepts any iterable of knowledge, e.g. a generator of model outputs.
+
+        Args:
+            graph (Iterable[Knowledge]): Knowledge to write
+            filepath (str): JSON file path
+            mode (str, optional): File mode, use "a" to append to an existing file. Defaults to "w".
+
+        Returns:
+            int: Number of knowledge instances written
+        """
+        count = 0
+
+        with open(filepath, mode) as file:
+            for kg in graph:
+                file.write(json.dumps(kg.to_json()) + "\n")
+                count += 1
+
+        return count
 
     def to_dataframe(self) -> pd.DataFrame:
         """Convert knowledge graph to a pandas dataframe
@@ -285,3 +376,258 @@ class KnowledgeGraph:
             KnowledgeGraph: Difference of two graphs
         """
         return KnowledgeGraph(set(self.graph).difference(set(other.graph)))
+
+
+class _RelationCache(dict):
+    """Resolves relation texts once per distinct text"""
+
+    def __init__(self, relation_type: KnowledgeRelationType) -> None:
+        super().__init__()
+        self.relation_type = relation_type
+
+    def __missing__(self, text):
+        relation = KnowledgeRelation.from_text(text, self.relation_type)
+        self[text] = relation
+        return relation
+
+
+def _csv_header(header):
+    # pandas does not accept a boolean header
+    if header is True:
+        return 0
+    if header is False:
+        return None
+    return header
+
+
+def _knowledge_from_columns(
+    graph_df: pd.DataFrame,
+    head_col: str,
+    relation_col: str,
+    tails_col: str,
+    relation_type: KnowledgeRelationType = KnowledgeRelationType.ATOMIC,
+    relations: Optional[_RelationCache] = None,
+) -> List[Knowledge]:
+    relations = relations if relations is not None else _RelationCache(relation_type)
+    return [
+        Knowledge(head=head, relation=relations[relation], tails=tails)
+        for head, relation, tails in zip(
+            graph_df[head_col].tolist(),
+            graph_df[relation_col].tolist(),
+            graph_df[tails_col].tolist(),
+        )
+    ]
+
+
+class ColumnarKnowledgeGraph(KnowledgeGraph):
+    """
+    Represents a knowledge graph in a compact columnar layout.
+    Heads, relations and tails are interned and edges are stored as integer arrays,
+    with tails kept in an offset + buffer layout. Knowledge instances are created on access
+    and only the head text is kept (head type and entity are not stored).
+    """
+
+    def __init__(self, graph: Iterable[Knowledge] = ()) -> None:
+        """Initialize a columnar knowledge graph
+
+        Args:
+            graph (Iterable[Knowledge], optional): Knowledge instances to store. Defaults to ().
+        """
+        self._head_texts: List[str] = []
+        self._head_ids: Dict[str, int] = {}
+        self._relations: List[KnowledgeRelation] = []
+        self._relation_ids: Dict[KnowledgeRelation, int] = {}
+        self._tail_texts: List[str] = []
+        self._tail_ids: Dict[str, int] = {}
+
+        self.head_column = array("i")
+        self.relation_column = array("i")
+        self.tail_offsets = array("q", [0])
+        self.tail_buffer = array("i")
+
+        self._head_index: Optional[Dict[int, List[int]]] = None
+        self._relation_index: Optional[Dict[int, List[int]]] = None
+
+        self.extend(graph)
+
+    @property
+    def graph(self) -> List[Knowledge]:
+        return list(self)
+
+    def __iter__(self):
+        return (self._knowledge(idx) for idx in range(len(self)))
+
+    def __len__(self):
+        return len(self.head_column)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self._knowledge(i) for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("knowledge graph index out of range")
+        return self._knowledge(idx)
+
+    def append(self, kg: Knowledge) -> None:
+        """Add a knowledge instance to the graph
+
+        Args:
+            kg (Knowledge): Knowledge to add
+        """
+        head_id = _intern(self._head_texts, self._head_ids, str(kg.head))
+        relation_id = _intern(self._relations, self._relation_ids, kg.relation)
+        idx = len(self)
+
+        self.head_column.append(head_id)
+        self.relation_column.append(relation_id)
+        for tail in kg.tails:
+            self.tail_buffer.append(_intern(self._tail_texts, self._tail_ids, tail))
+        self.tail_offsets.append(len(self.tail_buffer))
+
+        if self._head_index is not None:
+            self._head_index.setdefault(head_id, []).append(idx)
+        if self._relation_index is not None:
+            self._relation_index.setdefault(relation_id, []).append(idx)
+
+    def extend(self, graph: Iterable[Knowledge]) -> None:
+        """Add knowledge instances to the graph
+
+        Args:
+            graph (Iterable[Knowledge]): Knowledge instances to add
+        """
+        for kg in graph:
+            self.append(kg)
+
+    def by_head(self, head: Union[KnowledgeHead, str]) -> "ColumnarKnowledgeGraph":
+        """Find all knowledge with the given head
+
+        Args:
+            head (Union[KnowledgeHead, str]): Head to look up
+
+        Returns:
+            ColumnarKnowledgeGraph: Knowledge graph with matching knowledge
+        """
+        if self._head_index is None:
+            self._head_index = _build_index(self.head_column)
+
+        head_id = self._head_ids.get(str(head))
+        indices = self._head_index.get(head_id, []) if head_id is not None else []
+        return ColumnarKnowledgeGraph(self._knowledge(idx) for idx in indices)
+
+    def by_relation(
+        self, relation: Union[KnowledgeRelation, str]
+    ) -> "ColumnarKnowledgeGraph":
+        """Find all knowledge with the given relation
+
+        Args:
+            relation (Union[KnowledgeRelation, str]): Relation to look up
+
+        Returns:
+            ColumnarKnowledgeGraph: Knowledge graph with matching knowledge
+        """
+        if self._relation_index is None:
+            self._relation_index = _build_index(self.relation_column)
+
+        if not isinstance(relation, KnowledgeRelation):
+            relation = KnowledgeRelation.from_text(relation)
+
+        relation_id = self._relation_ids.get(relation)
+        indices = (
+            self._relation_index.get(relation_id, []) if relation_id is not None else []
+        )
+        return ColumnarKnowledgeGraph(self._knowledge(idx) for idx in indices)
+
+    def union(self, other: "KnowledgeGraph") -> "ColumnarKnowledgeGraph":
+        """Union two knowledge graphs
+
+        Args:
+            other (KnowledgeGraph): Knowledge graph to union with.
+
+        Returns:
+            ColumnarKnowledgeGraph: Merged knowledge graph
+        """
+        graph = self._select(lambda key: True)
+        keys = set(graph._keys())
+        for kg in other:
+            key = _knowledge_key(kg)
+            if key not in keys:
+                keys.add(key)
+                graph.append(kg)
+        return graph
+
+    def intersection(self, other: "KnowledgeGraph") -> "ColumnarKnowledgeGraph":
+        """Intersect two knowledge graphs
+
+        Args:
+            other (KnowledgeGraph): Knowledge graph to intersect with.
+
+        Returns:
+            ColumnarKnowledgeGraph: Intersection of two graphs
+        """
+        other_keys = set(_knowledge_key(kg) for kg in other)
+        return self._select(lambda key: key in other_keys)
+
+    def difference(self, other: "KnowledgeGraph") -> "ColumnarKnowledgeGraph":
+        """Subtract knowledge graphs
+
+        Args:
+            other (KnowledgeGraph): Knowledge graph to subtract.
+
+        Returns:
+            ColumnarKnowledgeGraph: Difference of two graphs
+        """
+        other_keys = set(_knowledge_key(kg) for kg in other)
+        return self._select(lambda key: key not in other_keys)
+
+    def _select(self, predicate) -> "ColumnarKnowledgeGraph":
+        graph = ColumnarKnowledgeGraph()
+        seen = set()
+        for idx, key in enumerate(self._keys()):
+            if key not in seen and predicate(key):
+                seen.add(key)
+                graph.append(self._knowledge(idx))
+        return graph
+
+    def _keys(self) -> Iterator[tuple]:
+        for idx in range(len(self)):
+            yield (
+                self._head_texts[self.head_column[idx]],
+                self._relations[self.relation_column[idx]],
+                tuple(self._tails(idx)),
+            )
+
+    def _tails(self, idx: int) -> List[str]:
+        return [
+            self._tail_texts[tail_id]
+            for tail_id in self.tail_buffer[
+                self.tail_offsets[idx] : self.tail_offsets[idx + 1]
+            ]
+        ]
+
+    def _knowledge(self, idx: int) -> Knowledge:
+        return Knowledge(
+            head=KnowledgeHead(self._head_texts[self.head_column[idx]]),
+            relation=self._relations[self.relation_column[idx]],
+            tails=self._tails(idx),
+        )
+
+
+def _intern(values: list, ids: dict, value) -> int:
+    value_id = ids.get(value)
+    if value_id is None:
+        value_id = len(values)
+        ids[value] = value_id
+        values.append(value)
+    return value_id
+
+
+def _build_index(column: array) -> Dict[int, List[int]]:
+    index: Dict[int, List[int]] = {}
+    for idx, value_id in enumerate(column):
+        index.setdefault(value_id, []).append(idx)
+    return index
+
+
+def _knowledge_key(kg: Knowledge) -> tuple:
+    return (str(kg.head), kg.relation, tuple(kg.tails))
@@ -1,8 +1,11 @@
-from typing import List
+from typing import List, Optional, Tuple, Union
 
 from abc import ABC, abstractmethod, abstractclassmethod
 from kogito.core.knowledge import KnowledgeGraph
+from kogito.core.utils import iter_chunks
+from kogito.evaluation.breakdown import ScoreBreakdown
 from kogito.evaluation.eval import topk_eval, METRIC_MAP
+from kogito.evaluation.incremental import IncrementalEvaluator
 
 
 class KnowledgeModel(ABC):
@@ -79,8 +82,12 @@ class KnowledgeModel(ABC):
         metrics: List[str] = ["bleu", "meteor", "rouge", "cider", "bert-score"],
         top_k: int = 1,
         *args,
+        workers: int = 1,
+        shard: bool = False,
+        chunk_size: Optional[int] = None,
+        return_breakdown: bool = False,
         **kwargs,
-    ) -> dict:
+    ) -> Union[dict, Tuple[dict, ScoreBreakdown]]:
         """Evaluate model on various metrics.
         Input graph should contain the reference tails, so that it can be used to score the model generations
         on the same input graph. Any arguments provided aside from the ones accepted by this method will be
@@ -92,12 +99,33 @@ class KnowledgeModel(ABC):
                 Defaults to ["bleu", "meteor", "rouge", "cider", "bert-score"].
             top_k (int, optional): Top k generations to evaluate. Defaults to 1.
             *args (optional): Extra arguments for `KnowledgeModel.generate` method.
+            workers (int, optional): Number of worker processes to compute metrics concurrently.
+                Only used if ``chunk_size`` is not given. Defaults to 1.
+            shard (bool, optional): Whether to also split BLEU, METEOR, ROUGE and CIDEr across
+                the worker processes by item. Scores are the same as without sharding. Defaults to False.
+            chunk_size (Optional[int], optional): If given, the input graph is generated and scored
+                chunk by chunk with an ``IncrementalEvaluator``, so that memory does not grow
+                with the size of the input graph. Defaults to None.
+            return_breakdown (bool, optional): Whether to also return a ``ScoreBreakdown`` with per-item scores
+                to compute scores and bootstrap confidence intervals by relation, head type and k.
+                Not supported with ``chunk_size``. Defaults to False.
             **kwargs (optional): Extra keyword arguments for ``KnowledgeModel.generate`` method.
 
         Returns:
-            dict: Dictionary of scores
+            Union[dict, Tuple[dict, ScoreBreakdown]]: Dictionary of scores and optionally the score breakdown
         """
-        return evaluate(self, input_graph, metrics, top_k=top_k, *args, **kwargs)
+        return evaluate(
+            self,
+            input_graph,
+            metrics,
+            top_k=top_k,
+            workers=workers,
+            shard=shard,
+            chunk_size=chunk_size,
+            return_breakdown=return_breakdown,
+            *args,
+            **kwargs,
+        )
 
 
 def evaluate(
@@ -106,6 +134,10 @@ def evaluate(
     metrics: List[str] = ["bleu", "meteor", "rouge", "cider", "bert-score"],
     top_k: int = 1,
     *args,
+    workers: int = 1,
+    shard: bool = False,
+    chunk_size: Optional[int] = None,
+    return_breakdown: bool = False,
     **kwargs,
 ):
     if not set(metrics).issubset(set(METRIC_MAP.keys())):
@@ -113,7 +145,33 @@ def evaluate(
             f"Invalid evaluation metrics found: {set(metrics) - set(METRIC_MAP.keys())}"
         )
 
+    if chunk_size:
+        if return_breakdown:
+            raise ValueError("Score breakdown is not supported with chunked evaluation")
+
+        evaluator = IncrementalEvaluator(metrics, k=top_k)
+
+        for chunk in iter_chunks(input_graph, chunk_size):
+            chunk_graph = KnowledgeGraph(chunk)
+            output_graph = model.generate(input_graph=chunk_graph, *args, **kwargs)
+            evaluator.update(_evaluation_data(chunk_graph, output_graph))
+
+        return evaluator.result()
+
     output_graph = model.generate(input_graph=input_graph, *args, **kwargs)
+    evaluation_data = _evaluation_data(input_graph, output_graph)
+
+    return topk_eval(
+        evaluation_data,
+        metrics,
+        k=top_k,
+        workers=workers,
+        shard=shard,
+        return_breakdown=return_breakdown,
+    )
+
+
+def _evaluation_data(input_graph: KnowledgeGraph, output_graph: KnowledgeGraph):
     evaluation_data = []
 
     for input_kg, output_kg in zip(input_graph, output_graph):
@@ -123,4 +181,4 @@ def evaluate(
 
         evaluation_data.append((output_kg, input_kg.tails))
 
-    return topk_eval(evaluation_data, metrics, k=top_k)
+    return evaluation_data
@@ -8,6 +8,8 @@ from spacy.lang.en.stop_words import STOP_WORDS
 from kogito.core.head import KnowledgeHead, KnowledgeHeadType
 from kogito.core.utils import IGNORE_WORDS
 
+EXCLUDED_WORDS = STOP_WORDS.union(IGNORE_WORDS)
+
 
 class KnowledgeHeadExtractor(ABC):
     """Base class for head extraction"""
@@ -73,10 +75,7 @@ class NounPhraseHeadExtractor(KnowledgeHeadExtractor):
         clean_text = []
 
         for token in doc:
-            if (
-                token.text not in STOP_WORDS.union(IGNORE_WORDS)
-                and token.pos_ != "PROPN"
-            ):
+            if token.text not in EXCLUDED_WORDS and token.pos_ != "PROPN":
                 clean_text.append(token.text)
 
                 if token.pos_ == "NOUN":
@@ -90,10 +89,10 @@ class NounPhraseHeadExtractor(KnowledgeHeadExtractor):
 
         for phrase in doc.noun_chunks:
             clean_phrase = []
-            phrase_doc = self.lang(phrase.text)
 
-            for token in phrase_doc:
-                if token.text not in STOP_WORDS.union(IGNORE_WORDS):
+            # Noun chunks are spans of the already parsed doc, no need to re-parse
+            for token in phrase:
+                if token.text not in EXCLUDED_WORDS:
                     clean_phrase.append(token.text)
 
             clean_text = " ".join(clean_phrase).strip()
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import torch
 import numpy as np
 import pandas as pd
@@ -6,7 +8,7 @@ from torch.optim import Adam
 from torch import nn
 import pytorch_lightning as pl
 from transformers import (
-    DistilBertTokenizer,
+    DistilBertTokenizerFast,
     DistilBertModel,
     PretrainedConfig,
     PreTrainedModel,
@@ -15,35 +17,45 @@ from transformers import (
 from kogito.core.processors.models.utils import Evaluator
 
 
+@lru_cache(maxsize=None)
+def get_tokenizer(tokenizer_type: str = "uncased") -> DistilBertTokenizerFast:
+    """Load a fast DistilBERT tokenizer once per process
+
+    Args:
+        tokenizer_type (str, optional): Tokenizer case, "uncased" or "cased". Defaults to "uncased".
+
+    Returns:
+        DistilBertTokenizerFast: Tokenizer
+    """
+    return DistilBertTokenizerFast.from_pretrained(f"distilbert-base-{tokenizer_type}")
+
+
 class DistilBERTHeadDataset(Dataset):
     def __init__(self, data, tokenizer_type="uncased"):
-        self.tokenizer = DistilBertTokenizer.from_pretrained(
-            f"distilbert-base-{tokenizer_type}"
-        )
+        self.tokenizer = get_tokenizer(tokenizer_type)
         self.labels = (
             np.asarray(data["label"].to_list())
             if isinstance(data, pd.DataFrame)
             else None
         )
         texts = data["text"] if isinstance(data, pd.DataFrame) else data
-        self.features = [
-            self.tokenizer(
-                text,
-                padding="max_length",
-                max_length=32,
-                truncation=True,
-                return_tensors="pt",
-            )
-            for text in texts
-        ]
+        # encode all texts at once, padded to the longest one
+        self.features = self.tokenizer(
+            list(texts),
+            padding="longest",
+            max_length=32,
+            truncation=True,
+            return_tensors="pt",
+        )
 
     def __len__(self):
-        return len(self.features)
+        return len(self.features["input_ids"])
 
     def __getitem__(self, idx):
+        features = {key: value[idx] for key, value in self.features.items()}
         if self.labels is not None:
-            return self.features[idx], self.labels[idx]
-        return self.features[idx]
+            return features, self.labels[idx]
+        return features
 
 
 class DistilBERTConfig(PretrainedConfig):
@@ -0,0 +1,118 @@
+from typing import Optional
+import os
+
+import numpy as np
+import torch
+from torch import nn
+
+ONNX_INPUT_NAMES = ["input_ids", "attention_mask"]
+ONNX_OUTPUT_NAMES = ["probs"]
+
+
+class _ProbabilityModule(nn.Module):
+    """Transformer relation classifier returning class probabilities"""
+
+    def __init__(self, model: nn.Module) -> None:
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return torch.sigmoid(self.model(input_ids, attention_mask))
+
+
+def _import_onnxruntime():
+    try:
+        import onnxruntime
+    except ImportError as e:
+        raise ImportError(
+            "onnxruntime is required for ONNX relation classifiers: pip install onnx onnxruntime"
+        ) from e
+    return onnxruntime
+
+
+def export_onnx(
+    model: nn.Module, path: str, quantize: bool = False, opset_version: int = 13
+) -> str:
+    """Export a DistilBERT or BERT relation classifier to ONNX
+
+    Args:
+        model (nn.Module): DistilBERTClassifier or BERTClassifier
+        path (str): Path of the ONNX file to write
+        quantize (bool, optional): Whether to quantize weights to int8 with dynamic (per-batch)
+                                   activation quantization. Defaults to False.
+        opset_version (int, optional): ONNX opset version. Defaults to 13.
+
+    Returns:
+        str: Path of the exported model
+    """
+    module = _ProbabilityModule(model).eval()
+    # batch and sequence length are dynamic, so heads can be padded to the longest one
+    input_ids = torch.ones((2, 8), dtype=torch.long)
+    attention_mask = torch.ones((2, 8), dtype=torch.long)
+    fp32_path = f"{os.path.splitext(path)[0]}.fp32.onnx" if quantize else path
+
+    with torch.no_grad():
+        torch.onnx.export(
+            module,
+            (input_ids, attention_mask),
+            fp32_path,
+            input_names=ONNX_INPUT_NAMES,
+            output_names=ONNX_OUTPUT_NAMES,
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "probs": {0: "batch"},
+            },
+            opset_version=opset_version,
+        )
+
+    if quantize:
+        _import_onnxruntime()
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+
+    return path
+
+
+class ONNXRelationClassifier:
+    """
+    Relation classifier running an exported ONNX model with onnxruntime on CPU.
+    """
+
+    def __init__(self, path: str, num_threads: Optional[int] = None) -> None:
+        """Load an exported relation classifier
+
+        Args:
+            path (str): Path of the ONNX file
+            num_threads (Optional[int], optional): Number of intra-op threads.
+                                                   If None, onnxruntime decides. Defaults to None.
+        """
+        onnxruntime = _import_onnxruntime()
+        options = onnxruntime.SessionOptions()
+
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.path = path
+        self.session = onnxruntime.InferenceSession(
+            path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [
+            model_input.name for model_input in self.session.get_inputs()
+        ]
+
+    def predict(self, batch: dict) -> np.ndarray:
+        """Predict relation class probabilities of a batch
+
+        Args:
+            batch (dict): Tokenized batch with ``input_ids`` and ``attention_mask`` tensors
+
+        Returns:
+            np.ndarray: Probability matrix of shape (batch size, number of classes)
+        """
+        inputs = {
+            name: np.asarray(batch[name], dtype=np.int64) for name in self.input_names
+        }
+        return self.session.run(ONNX_OUTPUT_NAMES, inputs)[0]
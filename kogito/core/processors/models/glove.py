@@ -0,0 +1,262 @@
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple, Union
+from collections.abc import Mapping
+from functools import lru_cache
+import argparse
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+VOCAB_WORDS_FILE = "vocab_words.npy"
+VOCAB_OFFSETS_FILE = "vocab_offsets.npy"
+VOCAB_IDS_FILE = "vocab_ids.npy"
+EMBEDDINGS_FILE = "embeddings.npy"
+LOOKUP_CACHE_SIZE = 65536
+# Directory where converted vocabularies are stored when they are not shipped with the package
+CACHE_DIR = os.environ.get(
+    "KOGITO_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "kogito")
+)
+
+
+class GloVeVocab(Mapping):
+    """
+    Read-only vocabulary mapping words to embedding ids.
+    Words are stored as a sorted table of UTF-8 bytes with offsets and looked up by binary search,
+    so the vocabulary is a few flat arrays that can be memory-mapped and shared between processes.
+    """
+
+    def __init__(self, words: np.ndarray, offsets: np.ndarray, ids: np.ndarray) -> None:
+        """Initialize a vocabulary
+
+        Args:
+            words (np.ndarray): Concatenated UTF-8 bytes of the sorted words
+            offsets (np.ndarray): Start offset of each word in ``words`` followed by the total length
+            ids (np.ndarray): Id of each word
+        """
+        self.words = words
+        self.offsets = offsets
+        self.ids = ids
+        self._lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._search)
+
+    @classmethod
+    def from_dict(cls, vocab: Dict[str, int]) -> "GloVeVocab":
+        """Build a vocabulary from a word to id dictionary
+
+        Args:
+            vocab (Dict[str, int]): Word to id dictionary. Non-string keys are skipped.
+
+        Returns:
+            GloVeVocab: Vocabulary
+        """
+        items = sorted(
+            (word.encode("utf-8"), index)
+            for word, index in vocab.items()
+            if isinstance(word, str)
+        )
+        offsets = np.zeros(len(items) + 1, dtype=np.int64)
+        np.cumsum([len(word) for word, _ in items], out=offsets[1:])
+        words = np.frombuffer(b"".join(word for word, _ in items), dtype=np.uint8)
+        ids = np.array([index for _, index in items], dtype=np.int64)
+        return cls(words, offsets, ids)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = "r") -> "GloVeVocab":
+        """Load a vocabulary saved with ``save``
+
+        Args:
+            path (str): Directory to load from
+            mmap_mode (Optional[str], optional): Memory-map mode passed to ``np.load``.
+                                                 If None, arrays are read into memory. Defaults to "r".
+
+        Returns:
+            GloVeVocab: Vocabulary
+        """
+        return cls(
+            np.load(os.path.join(path, VOCAB_WORDS_FILE), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, VOCAB_OFFSETS_FILE), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, VOCAB_IDS_FILE), mmap_mode=mmap_mode),
+        )
+
+    def save(self, path: str) -> None:
+        """Save vocabulary arrays to a directory
+
+        Args:
+            path (str): Directory to save to
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, VOCAB_WORDS_FILE), self.words)
+        np.save(os.path.join(path, VOCAB_OFFSETS_FILE), self.offsets)
+        np.save(os.path.join(path, VOCAB_IDS_FILE), self.ids)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lookup"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._search)
+
+    def _word(self, index: int) -> bytes:
+        return self.words[self.offsets[index] : self.offsets[index + 1]].tobytes()
+
+    def _search(self, word: str) -> int:
+        key = word.encode("utf-8")
+        low, high = 0, len(self.ids)
+
+        while low < high:
+            mid = (low + high) // 2
+            if self._word(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+
+        if low < len(self.ids) and self._word(low) == key:
+            return int(self.ids[low])
+
+        return -1
+
+    def get(self, word: str, default: Optional[int] = None) -> Optional[int]:
+        index = self._lookup(word) if isinstance(word, str) else -1
+        return default if index < 0 else index
+
+    def __getitem__(self, word: str) -> int:
+        index = self.get(word)
+        if index is None:
+            raise KeyError(word)
+        return index
+
+    def __contains__(self, word: object) -> bool:
+        return self.get(word) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self.ids)):
+            yield self._word(index).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def load_embeddings(path: str, mmap_mode: Optional[str] = "r") -> np.ndarray:
+    """Load an embedding matrix, memory-mapped by default
+
+    Args:
+        path (str): Path to the ``.npy`` file or to a directory saved with ``save_glove``
+        mmap_mode (Optional[str], optional): Memory-map mode passed to ``np.load``. Defaults to "r".
+
+    Returns:
+        np.ndarray: Embedding matrix
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, EMBEDDINGS_FILE)
+    return np.load(path, mmap_mode=mmap_mode)
+
+
+def save_glove(
+    path: str,
+    vocab: Dict[str, int],
+    embedding_matrix: Optional[np.ndarray] = None,
+    dtype: np.dtype = np.float32,
+) -> None:
+    """Save a vocabulary and embedding matrix in the memory-mappable format
+
+    Args:
+        path (str): Directory to save to
+        vocab (Dict[str, int]): Word to id dictionary
+        embedding_matrix (Optional[np.ndarray], optional): Embedding matrix. Defaults to None.
+        dtype (np.dtype, optional): Embedding data type, e.g. np.float16 to halve the size.
+                                    Defaults to np.float32.
+    """
+    if not isinstance(vocab, GloVeVocab):
+        vocab = GloVeVocab.from_dict(vocab)
+
+    vocab.save(path)
+
+    if embedding_matrix is not None:
+        np.save(
+            os.path.join(path, EMBEDDINGS_FILE),
+            np.asarray(embedding_matrix, dtype=dtype),
+        )
+
+
+def load_glove(
+    path: str, mmap_mode: Optional[str] = "r"
+) -> Tuple[GloVeVocab, Optional[np.ndarray]]:
+    """Load a vocabulary and embedding matrix saved with ``save_glove``
+
+    Args:
+        path (str): Directory to load from
+        mmap_mode (Optional[str], optional): Memory-map mode passed to ``np.load``. Defaults to "r".
+
+    Returns:
+        Tuple[GloVeVocab, Optional[np.ndarray]]: Vocabulary and embedding matrix (None if not saved)
+    """
+    vocab = GloVeVocab.load(path, mmap_mode=mmap_mode)
+    embeddings = None
+
+    if os.path.exists(os.path.join(path, EMBEDDINGS_FILE)):
+        embeddings = load_embeddings(path, mmap_mode=mmap_mode)
+
+    return vocab, embeddings
+
+
+def convert_legacy_glove(
+    vocab_file: Union[str, BinaryIO],
+    path: str,
+    embedding_matrix_file: Optional[str] = None,
+    dtype: np.dtype = np.float32,
+) -> str:
+    """Convert a pickled vocabulary dictionary (and embedding matrix) saved with ``np.save``
+    to the memory-mappable format. The output directory is written atomically,
+    so concurrent conversions to the same path are safe.
+
+    Args:
+        vocab_file (Union[str, BinaryIO]): Path or file object of the pickled vocabulary (e.g. vocab_glove_100d.npy)
+        path (str): Directory to save to
+        embedding_matrix_file (Optional[str], optional): Path of the embedding matrix
+            (e.g. embedding_matrix_glove_100d.npy). Defaults to None.
+        dtype (np.dtype, optional): Embedding data type. Defaults to np.float32.
+
+    Returns:
+        str: Directory of the converted vocabulary
+    """
+    vocab = np.load(vocab_file, allow_pickle=True).item()
+    embedding_matrix = None
+
+    if embedding_matrix_file is not None:
+        embedding_matrix = np.load(embedding_matrix_file, mmap_mode="r")
+
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=parent)
+
+    try:
+        save_glove(tmp_path, vocab, embedding_matrix, dtype=dtype)
+        os.rename(tmp_path, path)
+    except OSError:
+        # another process converted it first
+        if not os.path.isdir(path):
+            raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert a pickled GloVe vocabulary (and embedding matrix) to the memory-mapped format"
+    )
+    parser.add_argument("vocab", help="Pickled vocabulary, e.g. vocab_glove_100d.npy")
+    parser.add_argument("output", help="Output directory, e.g. glove_100d")
+    parser.add_argument(
+        "--embedding-matrix",
+        help="Embedding matrix, e.g. embedding_matrix_glove_100d.npy",
+    )
+    parser.add_argument("--dtype", default="float32", choices=["float16", "float32"])
+    args = parser.parse_args()
+
+    convert_legacy_glove(
+        args.vocab, args.output, args.embedding_matrix, dtype=np.dtype(args.dtype)
+    )
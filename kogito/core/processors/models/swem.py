@@ -5,12 +5,12 @@ from torch.optim import Adam
 from torch import nn
 import pytorch_lightning as pl
 import torch.nn.functional as F
-import spacy
 from torch.utils.data import Dataset
 from torch.nn.utils.rnn import pad_sequence
 from transformers import PretrainedConfig, PreTrainedModel
 
 from kogito.core.processors.models.utils import Evaluator, text_to_embedding
+from kogito.core.utils import load_spacy_lang
 
 
 class SWEMHeadDataset(Dataset):
@@ -27,7 +27,7 @@ class SWEMHeadDataset(Dataset):
         labels = data["label"] if isinstance(data, pd.DataFrame) else None
 
         if not lang:
-            lang = spacy.load("en_core_web_sm")
+            lang = load_spacy_lang("en_core_web_sm")
         self.texts = []
 
         if apply_pooling:
@@ -0,0 +1,214 @@
+from typing import Any, Callable, List, Mapping, Optional
+import json
+import os
+
+import numpy as np
+
+from kogito.core.processors.models.glove import (
+    EMBEDDINGS_FILE,
+    GloVeVocab,
+    load_embeddings,
+)
+
+LINEAR_WEIGHT_FILE = "linear_weight.npy"
+LINEAR_BIAS_FILE = "linear_bias.npy"
+CONFIG_FILE = "swem_config.json"
+PAD_ID = 0
+UNK_ID = 1
+
+
+def load_spacy_tokenizer(lang: Optional[Any] = None) -> Callable[[str], List[str]]:
+    """Get a function tokenizing text with spaCy's rule-based tokenizer only (no tagging or parsing)
+
+    Args:
+        lang (Optional[Any], optional): Spacy language pipeline whose tokenizer to use.
+                                        If None, a blank English pipeline is used. Defaults to None.
+
+    Returns:
+        Callable[[str], List[str]]: Tokenizer function
+    """
+    if lang is None:
+        import spacy
+
+        lang = spacy.blank("en")
+
+    tokenizer = lang.tokenizer
+    return lambda text: [token.text for token in tokenizer(text)]
+
+
+class SWEMPredictor:
+    """
+    NumPy implementation of SWEM relation classifier inference:
+    embedding lookup, pooling and a linear layer with a sigmoid, vectorized over a padded id matrix.
+    As in the torch model, texts are padded to the longest text of a call and pooled over the padded width.
+    """
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        weight: np.ndarray,
+        bias: np.ndarray,
+        vocab: Mapping,
+        pooling: str = "avg",
+        tokenizer: Optional[Callable[[str], List[str]]] = None,
+    ) -> None:
+        """Initialize a SWEM predictor
+
+        Args:
+            embeddings (np.ndarray): Embedding matrix of shape (vocabulary size, embedding dim)
+            weight (np.ndarray): Linear layer weight of shape (number of classes, embedding dim)
+            bias (np.ndarray): Linear layer bias of shape (number of classes,)
+            vocab (Mapping): Word to embedding id mapping
+            pooling (str, optional): Pooling type, "avg" or "max". Defaults to "avg".
+            tokenizer (Optional[Callable[[str], List[str]]], optional): Tokenizer function.
+                If None, spaCy's English tokenizer is used. Defaults to None.
+        """
+        self.embeddings = embeddings
+        self.weight = np.asarray(weight, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.vocab = vocab
+        self.pooling = pooling
+        self.tokenizer = tokenizer or load_spacy_tokenizer()
+
+    @classmethod
+    def from_classifier(
+        cls,
+        model,
+        vocab: Mapping,
+        tokenizer: Optional[Callable[[str], List[str]]] = None,
+    ) -> "SWEMPredictor":
+        """Export weights of a trained SWEM classifier
+
+        Args:
+            model (SWEMClassifier): SWEM classifier
+            vocab (Mapping): Word to embedding id mapping used by the classifier
+            tokenizer (Optional[Callable[[str], List[str]]], optional): Tokenizer function. Defaults to None.
+
+        Returns:
+            SWEMPredictor: Predictor
+        """
+        return cls(
+            embeddings=model.embedding.weight.detach().cpu().numpy(),
+            weight=model.linear.weight.detach().cpu().numpy(),
+            bias=model.linear.bias.detach().cpu().numpy(),
+            vocab=vocab,
+            pooling=model.config.pooling,
+            tokenizer=tokenizer,
+        )
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        tokenizer: Optional[Callable[[str], List[str]]] = None,
+        mmap_mode: Optional[str] = "r",
+    ) -> "SWEMPredictor":
+        """Load a predictor saved with ``save``
+
+        Args:
+            path (str): Directory to load from
+            tokenizer (Optional[Callable[[str], List[str]]], optional): Tokenizer function. Defaults to None.
+            mmap_mode (Optional[str], optional): Memory-map mode for the vocabulary and embeddings,
+                                                 so processes loading the same directory share them. Defaults to "r".
+
+        Returns:
+            SWEMPredictor: Predictor
+        """
+        with open(os.path.join(path, CONFIG_FILE)) as config_file:
+            config = json.load(config_file)
+
+        return cls(
+            embeddings=load_embeddings(path, mmap_mode=mmap_mode),
+            weight=np.load(os.path.join(path, LINEAR_WEIGHT_FILE)),
+            bias=np.load(os.path.join(path, LINEAR_BIAS_FILE)),
+            vocab=GloVeVocab.load(path, mmap_mode=mmap_mode),
+            pooling=config["pooling"],
+            tokenizer=tokenizer,
+        )
+
+    def save(self, path: str, dtype: np.dtype = np.float32) -> None:
+        """Save the predictor to a directory
+
+        Args:
+            path (str): Directory to save to
+            dtype (np.dtype, optional): Embedding data type. Defaults to np.float32.
+        """
+        vocab = self.vocab
+        if not isinstance(vocab, GloVeVocab):
+            vocab = GloVeVocab.from_dict(vocab)
+
+        vocab.save(path)
+        np.save(
+            os.path.join(path, EMBEDDINGS_FILE),
+            np.asarray(self.embeddings, dtype=dtype),
+        )
+        np.save(os.path.join(path, LINEAR_WEIGHT_FILE), self.weight)
+        np.save(os.path.join(path, LINEAR_BIAS_FILE), self.bias)
+
+        with open(os.path.join(path, CONFIG_FILE), "w") as config_file:
+            json.dump({"pooling": self.pooling}, config_file)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Convert texts to a matrix of embedding ids padded to the longest text
+
+        Args:
+            texts (List[str]): Texts to encode
+
+        Returns:
+            np.ndarray: Id matrix of shape (number of texts, longest text length)
+        """
+        ids = [
+            [self.vocab.get(token, UNK_ID) for token in self.tokenizer(text)]
+            for text in texts
+        ]
+        width = max((len(text_ids) for text_ids in ids), default=0)
+        lengths = np.array([len(text_ids) for text_ids in ids], dtype=np.int64)
+        matrix = np.full((len(ids), width), PAD_ID, dtype=np.int64)
+        matrix[np.arange(width) < lengths[:, None]] = [
+            index for text_ids in ids for index in text_ids
+        ]
+        return matrix
+
+    def predict_ids(self, ids: np.ndarray) -> np.ndarray:
+        """Predict relation class probabilities from a padded id matrix
+
+        Args:
+            ids (np.ndarray): Id matrix of shape (number of texts, width)
+
+        Returns:
+            np.ndarray: Probability matrix of shape (number of texts, number of classes)
+        """
+        if ids.shape[1] == 0:
+            pooled = np.zeros((len(ids), self.weight.shape[1]), dtype=np.float32)
+        else:
+            vectors = np.asarray(self.embeddings[ids], dtype=np.float32)
+            if self.pooling == "max":
+                pooled = vectors.max(axis=1)
+            else:
+                pooled = vectors.mean(axis=1)
+
+        logits = pooled @ self.weight.T + self.bias
+        # numerically stable sigmoid
+        return 0.5 * (1.0 + np.tanh(0.5 * logits))
+
+    def predict(self, texts: List[str], batch_size: int = 1024) -> np.ndarray:
+        """Predict relation class probabilities of texts
+
+        Args:
+            texts (List[str]): Texts to classify
+            batch_size (int, optional): Number of texts pooled at once to bound memory. Defaults to 1024.
+
+        Returns:
+            np.ndarray: Probability matrix of shape (number of texts, number of classes)
+        """
+        ids = self.encode(texts)
+
+        if len(ids) == 0:
+            return np.zeros((0, len(self.bias)), dtype=np.float32)
+
+        return np.concatenate(
+            [
+                self.predict_ids(ids[start : start + batch_size])
+                for start in range(0, len(ids), batch_size)
+            ]
+        )
@@ -1,11 +1,12 @@
 import torchmetrics
 import numpy as np
-import spacy
+
+from kogito.core.utils import load_spacy_lang
 
 
 def text_to_embedding(text, vocab, embedding_matrix, pooling="max", lang=None):
     if not lang:
-        lang = spacy.load("en_core_web_sm")
+        lang = load_spacy_lang("en_core_web_sm")
 
     doc = lang(text)
     vectors = []
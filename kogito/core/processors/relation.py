@@ -1,14 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional, Type
+from typing import TYPE_CHECKING, Dict, List, Mapping, Tuple, Optional, Type
 from functools import partial
+import os
 import pkgutil
 from io import BytesIO
 
 import numpy as np
-import torch
-import pytorch_lightning as pl
 from spacy.language import Language
-from torch.utils.data import DataLoader, Dataset
 
 from kogito.core.head import KnowledgeHead
 from kogito.core.relation import (
@@ -19,14 +17,42 @@ from kogito.core.relation import (
     SOCIAL_RELATIONS,
 )
 
-from kogito.core.processors.models.swem import SWEMHeadDataset, SWEMClassifier
-from kogito.core.processors.models.distilbert import (
-    DistilBERTHeadDataset,
-    DistilBERTClassifier,
+from kogito.core.processors.models.glove import (
+    CACHE_DIR as GLOVE_CACHE_DIR,
+    GloVeVocab,
+    convert_legacy_glove,
 )
-from kogito.core.processors.models.bert import BERTHeadDataset, BERTClassifier
+from kogito.core.processors.models.swem_numpy import (
+    SWEMPredictor,
+    load_spacy_tokenizer,
+)
+
+if TYPE_CHECKING:
+    import pytorch_lightning as pl
+    from torch.utils.data import Dataset
+
+# torch, pytorch_lightning and the classifier modules are imported where they are used,
+# so that the NumPy SWEM backend does not need them
 
 RELATION_CLASSES = [PHYSICAL_RELATIONS, EVENT_RELATIONS, SOCIAL_RELATIONS]
+SWEM_GLOVE_PATH = os.path.join(os.path.dirname(__file__), "data", "glove_100d")
+
+
+def match_relation_classes(probs: np.ndarray, threshold: float = 0.5) -> np.ndarray:
+    """Match relation classes from class probabilities.
+    Heads without any class above the threshold are matched to their most probable class.
+
+    Args:
+        probs (np.ndarray): Probability matrix of shape (number of heads, number of relation classes)
+        threshold (float, optional): Probability threshold. Defaults to 0.5.
+
+    Returns:
+        np.ndarray: Boolean matrix of matched relation classes
+    """
+    predictions = probs >= threshold
+    unmatched = np.flatnonzero(~predictions.any(axis=1))
+    predictions[unmatched, probs[unmatched].argmax(axis=1)] = True
+    return predictions
 
 
 class KnowledgeRelationMatcher(ABC):
@@ -47,7 +73,7 @@ class KnowledgeRelationMatcher(ABC):
         self,
         heads: List[KnowledgeHead],
         relations: Optional[List[KnowledgeRelation]] = None,
-        **kwargs
+        **kwargs,
     ) -> List[Tuple[KnowledgeHead, KnowledgeRelation]]:
         """Match relations to given heads
 
@@ -73,7 +99,7 @@ class SimpleRelationMatcher(KnowledgeRelationMatcher):
         self,
         heads: List[KnowledgeHead],
         relations: List[KnowledgeRelation] = None,
-        **kwargs
+        **kwargs,
     ) -> List[Tuple[KnowledgeHead, KnowledgeRelation]]:
         head_relations = []
 
@@ -92,76 +118,244 @@ class SimpleRelationMatcher(KnowledgeRelationMatcher):
 class ModelBasedRelationMatcher(KnowledgeRelationMatcher):
     """Matches relations based on relation classifiers"""
 
+    # Whether the classifier can be exported to and run with ONNX (tokenized transformer inputs)
+    supports_onnx = False
+
     def __init__(
         self,
         name: str,
-        dataset_class: Type[Dataset],
-        model_class: Type[pl.LightningModule],
-        model_path: str,
+        dataset_class: Optional[Type["Dataset"]],
+        model_class: Optional[Type["pl.LightningModule"]],
+        model_path: Optional[str],
         batch_size: int = 64,
         lang: Optional[Language] = None,
+        threshold: float = 0.5,
+        num_threads: Optional[int] = None,
+        onnx_path: Optional[str] = None,
     ) -> None:
         """Initialize a model based relation matcher
 
         Args:
             name (str): Unique relation matcher name
-            dataset_class (Type[Dataset]): Dataset class to use
-            model_class (Type[pl.LightningModule]): Model class to use
-            model_path (str): Model path to load model from
+            dataset_class (Optional[Type[Dataset]]): Dataset class to use
+            model_class (Optional[Type[pl.LightningModule]]): Model class to use
+            model_path (Optional[str]): Model path to load model from. If None, no model is loaded
+                                        and the subclass has to override :meth:`predict`.
             batch_size (int, optional): Batch size for inference. Defaults to 64.
             lang (Optional[Language], optional): Spacy lang pipeline. Defaults to None.
+            threshold (float, optional): Probability threshold for a relation class to match. Defaults to 0.5.
+            num_threads (Optional[int], optional): Number of threads torch uses for inference.
+                                                   If None, the current setting is kept. Defaults to None.
+            onnx_path (Optional[str], optional): Path of a classifier exported with :meth:`export_onnx`.
+                                                 If given, it is run with onnxruntime instead of loading
+                                                 the torch model. Only supported by DistilBERT and
+                                                 BERT matchers. Defaults to None.
+
+        Raises:
+            ValueError: if ``onnx_path`` is given for a matcher without ONNX support
         """
+        if onnx_path and not self.supports_onnx:
+            raise ValueError(f"{type(self).__name__} does not support ONNX classifiers")
+
         super().__init__(name, lang)
         self.dataset_class = dataset_class
         self.model_class = model_class
         self.model_path = model_path
         self.batch_size = batch_size
-        self.model = model_class.from_pretrained(model_path)
+        self.threshold = threshold
+        self.num_threads = num_threads
+        self.onnx_path = onnx_path
+
+        self.model = None
+
+        if onnx_path:
+            from kogito.core.processors.models.export import ONNXRelationClassifier
+
+            self.model = ONNXRelationClassifier(onnx_path, num_threads=num_threads)
+        elif model_path:
+            self.model = model_class.from_pretrained(model_path)
+            self.model.eval()
+
+    def export_onnx(self, path: str, quantize: bool = False) -> str:
+        """Export the relation classifier to ONNX to run it with ``onnx_path``.
+        Supported for DistilBERT and BERT classifiers.
+
+        Args:
+            path (str): Path of the ONNX file to write
+            quantize (bool, optional): Whether to apply dynamic int8 quantization. Defaults to False.
+
+        Raises:
+            ValueError: if the matcher does not support ONNX or its classifier is already exported
+
+        Returns:
+            str: Path of the exported model
+        """
+        if not self.supports_onnx:
+            raise ValueError(f"{type(self).__name__} does not support ONNX export")
+
+        if self.onnx_path:
+            raise ValueError("Relation classifier is already exported")
+
+        from kogito.core.processors.models.export import export_onnx
+
+        return export_onnx(self.model, path, quantize=quantize)
+
+    def predict(self, data: List[str]) -> np.ndarray:
+        """Predict relation class probabilities of given heads.
+        Batches are fed to the model directly (without a Lightning trainer) under inference mode.
+
+        Args:
+            data (List[str]): Head texts
+
+        Returns:
+            np.ndarray: Probability matrix of shape (number of heads, number of relation classes)
+        """
+        if not data:
+            return np.zeros((0, len(RELATION_CLASSES)), dtype=np.float32)
+
+        import torch
+        from pytorch_lightning.utilities import move_data_to_device
+        from torch.utils.data import DataLoader
+
+        dataset = self.dataset_class(data)
+        dataloader = DataLoader(dataset, batch_size=self.batch_size)
+
+        if self.onnx_path:
+            return np.concatenate([self.model.predict(batch) for batch in dataloader])
+
+        device = next(self.model.parameters()).device
+        num_threads = torch.get_num_threads()
+
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+
+        try:
+            with torch.inference_mode():
+                predictions = [
+                    self.model.predict_step(
+                        move_data_to_device(batch, device), batch_idx
+                    ).cpu()
+                    for batch_idx, batch in enumerate(dataloader)
+                ]
+        finally:
+            torch.set_num_threads(num_threads)
+
+        return torch.cat(predictions).numpy()
 
     def match(
         self,
         heads: List[KnowledgeHead],
         relations: List[KnowledgeRelation] = None,
-        **kwargs
+        **kwargs,
     ) -> List[Tuple[KnowledgeHead, KnowledgeRelation]]:
-        data = [str(head) for head in heads]
-        dataset = self.dataset_class(data)
-        dataloader = DataLoader(dataset, batch_size=self.batch_size)
-        trainer = pl.Trainer()
-        predictions = torch.cat(
-            trainer.predict(self.model, dataloaders=dataloader)
-        ).numpy()
-        head_relations = []
-
-        for head, prob in zip(heads, predictions):
-            prediction = np.where(prob >= 0.5, 1, 0).tolist()
-            pred_rel_classes = [
-                RELATION_CLASSES[idx]
-                for idx, pred in enumerate(prediction)
-                if pred == 1
+        probs = self.predict([str(head) for head in heads])
+        predictions = match_relation_classes(probs, self.threshold)
+        rel_classes = RELATION_CLASSES
+
+        if relations:
+            rel_classes = [
+                set(rel_class).intersection(set(relations))
+                for rel_class in RELATION_CLASSES
             ]
 
-            if not pred_rel_classes:
-                pred_rel_classes = [RELATION_CLASSES[np.argmax(prob)]]
+        head_relations = []
 
-            for rel_class in pred_rel_classes:
-                rels_to_match = rel_class
-                if relations:
-                    rels_to_match = set(rels_to_match).intersection(set(relations))
-                for relation in rels_to_match:
-                    head_relations.append((head, relation))
+        for head_idx, class_idx in zip(*np.nonzero(predictions)):
+            head = heads[head_idx]
+            for relation in rel_classes[class_idx]:
+                head_relations.append((head, relation))
 
         return head_relations
 
 
+def relation_matcher_parity(
+    reference: ModelBasedRelationMatcher,
+    candidate: ModelBasedRelationMatcher,
+    heads: List[str],
+) -> Dict[str, float]:
+    """Compare predictions of two relation matchers, e.g. an exported or quantized classifier
+    against the original one.
+
+    Args:
+        reference (ModelBasedRelationMatcher): Reference matcher
+        candidate (ModelBasedRelationMatcher): Matcher to check
+        heads (List[str]): Head texts to predict for
+
+    Returns:
+        Dict[str, float]: Maximum absolute probability difference ("max_abs_diff"), fraction of heads
+                          matched to the same relation classes ("class_agreement") and fraction of
+                          matching class decisions ("decision_agreement")
+    """
+    reference_probs = reference.predict(heads)
+    candidate_probs = candidate.predict(heads)
+    reference_classes = match_relation_classes(reference_probs, reference.threshold)
+    candidate_classes = match_relation_classes(candidate_probs, candidate.threshold)
+    agreement = reference_classes == candidate_classes
+
+    return {
+        "max_abs_diff": float(np.abs(reference_probs - candidate_probs).max(initial=0)),
+        "class_agreement": float(agreement.all(axis=1).mean()) if heads else 1.0,
+        "decision_agreement": float(agreement.mean()) if heads else 1.0,
+    }
+
+
 class SWEMRelationMatcher(ModelBasedRelationMatcher):
     """Relation matcher based on Simple Word Embeddings (GloVes)"""
 
-    def __init__(self, name: str, lang: Optional[Language] = None) -> None:
-        vocab = np.load(
-            BytesIO(pkgutil.get_data(__name__, "data/vocab_glove_100d.npy")),
-            allow_pickle=True,
-        ).item()
+    def __init__(
+        self,
+        name: str,
+        lang: Optional[Language] = None,
+        glove_path: Optional[str] = None,
+        backend: str = "torch",
+        legacy_vocab: bool = False,
+        predictor_path: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        """Initialize a SWEM based relation matcher
+
+        Args:
+            name (str): Unique relation matcher name
+            lang (Optional[Language], optional): Spacy lang pipeline. Defaults to None.
+            glove_path (Optional[str], optional): Directory of a GloVe vocabulary saved with
+                :func:`kogito.core.processors.models.glove.save_glove`. It is memory-mapped, so processes
+                loading it share the same pages. If None, the bundled vocabulary is converted once to
+                this format and cached (see :func:`load_swem_vocab`). Defaults to None.
+            backend (str, optional): Inference backend, "torch" or "numpy". The numpy backend exports
+                the classifier weights to :class:`kogito.core.processors.models.swem_numpy.SWEMPredictor`
+                and only runs spaCy's tokenizer on heads. Defaults to "torch".
+            legacy_vocab (bool, optional): Whether to unpickle the bundled vocabulary dictionary
+                instead of memory-mapping it. Defaults to False.
+            predictor_path (Optional[str], optional): Directory of a predictor saved with
+                :meth:`kogito.core.processors.models.swem_numpy.SWEMPredictor.save`. If given, it is loaded
+                memory-mapped with the numpy backend instead of loading the torch classifier
+                (``glove_path`` and ``legacy_vocab`` are ignored). Defaults to None.
+        """
+        if backend not in ("torch", "numpy"):
+            raise ValueError(
+                f"Unknown backend: {backend}. Available backends: torch, numpy"
+            )
+
+        if predictor_path and backend != "numpy":
+            raise ValueError("predictor_path requires the numpy backend")
+
+        if predictor_path:
+            super().__init__(
+                name,
+                dataset_class=None,
+                model_class=None,
+                model_path=None,
+                lang=lang,
+                **kwargs,
+            )
+            self.predictor = SWEMPredictor.load(
+                predictor_path, tokenizer=load_spacy_tokenizer(lang)
+            )
+            return
+
+        from kogito.core.processors.models.swem import SWEMHeadDataset, SWEMClassifier
+
+        vocab = load_swem_vocab(glove_path, legacy=legacy_vocab)
         dataset_class = partial(SWEMHeadDataset, vocab=vocab, lang=lang)
         model_class = SWEMClassifier
         model_path = "mismayil/kogito-rc-swem"
@@ -171,13 +365,64 @@ class SWEMRelationMatcher(ModelBasedRelationMatcher):
             model_class=model_class,
             model_path=model_path,
             lang=lang,
+            **kwargs,
         )
+        self.predictor = None
+
+        if backend == "numpy":
+            self.predictor = SWEMPredictor.from_classifier(
+                self.model, vocab, tokenizer=load_spacy_tokenizer(lang)
+            )
+
+    def predict(self, data: List[str]) -> np.ndarray:
+        if self.predictor is not None:
+            return self.predictor.predict(data)
+        return super().predict(data)
+
+
+def load_swem_vocab(glove_path: Optional[str] = None, legacy: bool = False) -> Mapping:
+    """Load the GloVe vocabulary of the SWEM relation classifier in the memory-mapped format.
+    If it is neither shipped with the package nor converted yet, the bundled pickled vocabulary is converted
+    once into ``kogito.core.processors.models.glove.CACHE_DIR`` and memory-mapped from there on.
+
+    Args:
+        glove_path (Optional[str], optional): Directory of a vocabulary saved with
+            :func:`kogito.core.processors.models.glove.save_glove`. Defaults to None.
+        legacy (bool, optional): Whether to unpickle the bundled vocabulary dictionary instead. Defaults to False.
+
+    Returns:
+        Mapping: Word to id mapping
+    """
+    if legacy:
+        return np.load(BytesIO(_bundled_swem_vocab()), allow_pickle=True).item()
+
+    if glove_path is None:
+        glove_path = SWEM_GLOVE_PATH
+
+        if not os.path.isdir(glove_path):
+            glove_path = os.path.join(GLOVE_CACHE_DIR, "glove_100d")
+
+        if not os.path.isdir(glove_path):
+            convert_legacy_glove(BytesIO(_bundled_swem_vocab()), glove_path)
+
+    return GloVeVocab.load(glove_path)
+
+
+def _bundled_swem_vocab() -> bytes:
+    return pkgutil.get_data(__name__, "data/vocab_glove_100d.npy")
 
 
 class DistilBERTRelationMatcher(ModelBasedRelationMatcher):
     """Relation matcher based on DistilBERT embeddings"""
 
-    def __init__(self, name: str, lang: Optional[Language] = None) -> None:
+    supports_onnx = True
+
+    def __init__(self, name: str, lang: Optional[Language] = None, **kwargs) -> None:
+        from kogito.core.processors.models.distilbert import (
+            DistilBERTHeadDataset,
+            DistilBERTClassifier,
+        )
+
         dataset_class = DistilBERTHeadDataset
         model_class = DistilBERTClassifier
         model_path = "mismayil/kogito-rc-distilbert"
@@ -187,13 +432,18 @@ class DistilBERTRelationMatcher(ModelBasedRelationMatcher):
             model_class=model_class,
             model_path=model_path,
             lang=lang,
+            **kwargs,
         )
 
 
 class BERTRelationMatcher(ModelBasedRelationMatcher):
     """Relation matcher based on BERT embeddings"""
 
-    def __init__(self, name: str, lang: Optional[Language] = None) -> None:
+    supports_onnx = True
+
+    def __init__(self, name: str, lang: Optional[Language] = None, **kwargs) -> None:
+        from kogito.core.processors.models.bert import BERTHeadDataset, BERTClassifier
+
         dataset_class = BERTHeadDataset
         model_class = BERTClassifier
         model_path = "mismayil/kogito-rc-bert"
@@ -203,6 +453,7 @@ class BERTRelationMatcher(ModelBasedRelationMatcher):
             model_class=model_class,
             model_path=model_path,
             lang=lang,
+            **kwargs,
         )
 
 
@@ -213,7 +464,7 @@ class GraphBasedRelationMatcher(KnowledgeRelationMatcher):
         self,
         heads: List[KnowledgeHead],
         relations: List[KnowledgeRelation] = None,
-        **kwargs
+        **kwargs,
     ) -> List[Tuple[KnowledgeHead, KnowledgeRelation]]:
         sample_graph = kwargs.get("sample_graph")
         head_relations = []
@@ -1,5 +1,6 @@
 from typing import Callable, Optional
 from enum import Enum
+from functools import lru_cache
 from kogito.core.head import KnowledgeHeadType
 from kogito.core.utils import vp_present_participle, article, posessive
 
@@ -74,7 +75,7 @@ class KnowledgeRelation:
         """
         if self.verbalizer:
             kwargs["tail"] = tail
-            text = self.verbalizer(head, **kwargs).strip()
+            text = _verbalize(self.verbalizer, head, **kwargs).strip()
             if include_tail and tail:
                 return f"{text} {tail}"
             return f"{text} "
@@ -115,6 +116,24 @@ class KnowledgeRelation:
         )
 
 
+VERBALIZATION_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=VERBALIZATION_CACHE_SIZE)
+def _cached_verbalize(verbalizer: Callable, head: str, kwargs_items: tuple) -> str:
+    return verbalizer(head, **dict(kwargs_items))
+
+
+def _verbalize(verbalizer: Callable, head: str, **kwargs) -> str:
+    # Memoize verbalizations, falling back to a direct call for unhashable arguments
+    key = tuple(sorted(kwargs.items()))
+    try:
+        hash((verbalizer, head, key))
+    except TypeError:
+        return verbalizer(head, **kwargs)
+    return _cached_verbalize(verbalizer, head, key)
+
+
 # Verbalizers
 def at_location_verbalizer(head: str, **kwargs):
     text = f"You are likely to find {article(head)} {head} in"
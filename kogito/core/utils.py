@@ -3,7 +3,8 @@ import inflect
 import itertools
 import json
 import pickle
-from typing import Callable, Dict, Iterable, List
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional
 import uuid
 
 import numpy as np
@@ -18,22 +19,37 @@ IGNORE_WORDS = set(["PersonX", "PersonY", "PersonZ", "_", "'", "-"])
 ROUGE_KEYS = ["rouge1", "rouge2", "rougeL"]
 
 
+@lru_cache(maxsize=None)
+def load_spacy_lang(name: str = "en_core_web_sm"):
+    """Load a spacy language pipeline once per process"""
+    return spacy.load(name)
+
+
+@lru_cache(maxsize=None)
+def get_inflection_engine():
+    """Create an inflection engine once per process"""
+    return inflect.engine()
+
+
+@lru_cache(maxsize=4096)
 def vp_present_participle(phrase):
-    nlp = spacy.load("en_core_web_sm")
-    doc = nlp(phrase)
-    inflection_engine = inflect.engine()
+    doc = load_spacy_lang("en_core_web_sm")(phrase)
+    inflection_engine = get_inflection_engine()
     return " ".join(
         [
-            inflection_engine.present_participle(token.text)
-            if token.pos_ == "VERB" and token.tag_ != "VGG"
-            else token.text
+            (
+                inflection_engine.present_participle(token.text)
+                if token.pos_ == "VERB" and token.tag_ != "VGG"
+                else token.text
+            )
             for token in doc
         ]
     )
 
 
+@lru_cache(maxsize=4096)
 def posessive(word):
-    inflection_engine = inflect.engine()
+    inflection_engine = get_inflection_engine()
     if inflection_engine.singular_noun(word) is False:
         return "have"
     else:
@@ -128,6 +144,34 @@ class SortishSampler(Sampler):
         return iter(sort_idx)
 
 
+def length_bucketed_batches(
+    lengths: List[int], batch_size: int, max_tokens: Optional[int] = None
+) -> List[List[int]]:
+    """Group indices into batches of similar length for inference.
+    Indices are sorted by length and a new batch is started when either batch_size
+    or the padded token budget (batch length * longest length) would be exceeded."""
+    batches = []
+    batch: List[int] = []
+    batch_max_len = 0
+
+    for idx in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        max_len = max(batch_max_len, lengths[idx])
+        if batch and (
+            len(batch) >= batch_size
+            or (max_tokens is not None and max_len * (len(batch) + 1) > max_tokens)
+        ):
+            batches.append(batch)
+            batch = []
+            max_len = lengths[idx]
+        batch.append(idx)
+        batch_max_len = max_len
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
 def pickle_load(path):
     """pickle.load(path)"""
     with open(path, "rb") as f:
@@ -202,6 +246,15 @@ def chunks(lst, n):
         yield lst[i : i + n]
 
 
+def iter_chunks(iterable, n):
+    """Yield successive n-sized lists from any iterable, e.g. a stream of knowledge."""
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, n))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, n))
+
+
 def get_uuid(length=8):
     u = str(uuid.uuid4())
     if length is not None:
@@ -1,15 +1,19 @@
-from kogito.evaluation.bert_score.score import score
+from kogito.evaluation.bert_score.score import BertScorer
 
 # Code for BertScore reused from original implementation: https://github.com/Tiiiger/bert_score
 
 
 class BertScore:
-    def __init__(self):
+    def __init__(self, **kwargs):
+        # keyword arguments are passed to BertScorer, e.g. cache="bert_score_cache.sqlite"
+        # to reuse reference embeddings across evaluations
         self._hypo_for_image = {}
         self.ref_for_image = {}
+        self.scorer = BertScorer(**kwargs)
 
-    def compute_score(self, gts, res):
-
+    def pairs(self, gts, res):
+        # each hypothesis is paired with every reference of its image,
+        # same_indices marks where the pairs of each image end
         assert gts.keys() == res.keys()
         imgIds = gts.keys()
 
@@ -30,7 +34,11 @@ class BertScore:
             ref_input += ref
             same_indices.append(len(ref_input))
 
-        p, r, f_scores = score(hyp_input, ref_input)
+        return hyp_input, ref_input, same_indices
+
+    def compute_score(self, gts, res):
+        hyp_input, ref_input, same_indices = self.pairs(gts, res)
+        p, r, f_scores = self.scorer.score(hyp_input, ref_input)
 
         prev_idx = 0
         aggreg_f1_scores = []
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import sqlite3
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Persistent on-disk cache of BERT token embeddings backed by SQLite.
+    Entries are keyed by model, number of layers and a hash of the sentence.
+    """
+
+    def __init__(self, path="bert_score_cache.sqlite"):
+        """
+        Args:
+            - :param: `path` (str): path to the cache database file
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, ids TEXT NOT NULL, embedding BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def key(model_id, sentence):
+        """
+        Cache key of a sentence embedded by a given model.
+        Args:
+            - :param: `model_id` (str): model name and number of layers
+            - :param: `sentence` (str): sentence
+        """
+        return hashlib.sha256(f"{model_id}\n{sentence}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys):
+        """
+        Look up multiple keys at once.
+        Args:
+            - :param: `keys` (list of str): cache keys
+        Returns a dict mapping found keys to (token ids, float32 array of shape [len(ids), d]) pairs.
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        # Stay below SQLite's default limit on query parameters
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start : start + 500]
+            rows = self._conn.execute(
+                f"SELECT key, ids, embedding FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for key, ids, embedding in rows:
+                ids = json.loads(ids)
+                found[key] = (
+                    ids,
+                    np.frombuffer(embedding, dtype=np.float32).reshape(len(ids), -1),
+                )
+
+        self.hits += len(found)
+        self.misses += len(unique_keys) - len(found)
+        return found
+
+    def set_many(self, items):
+        """
+        Store multiple entries at once.
+        Args:
+            - :param: `items` (list of tuple): (key, token ids, embedding array) triples
+        """
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, ids, embedding) VALUES (?, ?, ?)",
+            [
+                (
+                    key,
+                    json.dumps(ids),
+                    np.asarray(embedding, dtype=np.float32).tobytes(),
+                )
+                for key, ids, embedding in items
+            ],
+        )
+        self._conn.commit()
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        self._conn.execute("DELETE FROM embeddings")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        """Close the underlying database connection"""
+        self._conn.close()
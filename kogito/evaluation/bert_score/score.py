@@ -1,37 +1,52 @@
+import hashlib
+import json
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
 import torch
-from collections import defaultdict
-from transformers import BertTokenizer, BertModel
+from transformers import BertTokenizerFast, BertModel
 
+from kogito.evaluation.bert_score.cache import EmbeddingCache
 from kogito.evaluation.bert_score.utils import (
-    get_idf_dict,
-    bert_cos_score_idf,
+    encode,
+    document_frequency,
+    get_idf_weights,
+    idf_weights,
+    bert_encode,
+    greedy_cos,
+    greedy_cos_idf,
+    padding,
     bert_types,
 )
 
+# Number of reference sets whose idf weights are kept by a BertScorer
+IDF_CACHE_SIZE = 8
 
-def score(
-    cands,
-    refs,
-    bert="bert-base-multilingual-cased",
-    num_layers=8,
-    no_idf=False,
-    batch_size=64,
-):
+
+@lru_cache(maxsize=None)
+def get_tokenizer(bert="bert-base-multilingual-cased"):
     """
-    BERTScore metric.
+    Load a fast BERT tokenizer once per process.
+    Args:
+        - :param: `bert` (str): bert specification
+    """
+    assert bert in bert_types
+    return BertTokenizerFast.from_pretrained(bert)
+
+
+@lru_cache(maxsize=None)
+def get_model(bert="bert-base-multilingual-cased", num_layers=8):
+    """
+    Load a BERT tokenizer and model truncated to `num_layers` layers once per process.
     Args:
-        - :param: `cands` (list of str): candidate sentences
-        - :param: `refs` (list of str): reference sentences
         - :param: `bert` (str): bert specification
         - :param: `num_layers` (int): the layer of representation to use
-        - :param: `verbose` (bool): turn on intermediate status update
-        - :param: `no_idf` (bool): do not use idf weighting
-        - :param: `batch_size` (int): bert score processing batch size
+    Returns a (tokenizer, model, device) triple.
     """
-    assert len(cands) == len(refs)
     assert bert in bert_types
 
-    tokenizer = BertTokenizer.from_pretrained(bert)
+    tokenizer = get_tokenizer(bert)
     model = BertModel.from_pretrained(bert)
     model.eval()
     device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -42,20 +57,273 @@ def score(
         [layer for layer in model.encoder.layer[:num_layers]]
     )
 
-    if no_idf:
-        idf_dict = defaultdict(lambda: 1.0)
+    return tokenizer, model, device
+
+
+class BertScorer:
+    """
+    Long-lived BERTScore engine.
+    The model is loaded lazily through `get_model` and each unique sentence is embedded once,
+    optionally reusing embeddings stored in an on-disk `EmbeddingCache`.
+    """
+
+    def __init__(
+        self,
+        bert="bert-base-multilingual-cased",
+        num_layers=8,
+        no_idf=False,
+        batch_size=64,
+        cache=None,
+    ):
+        """
+        Args:
+            - :param: `bert` (str): bert specification
+            - :param: `num_layers` (int): the layer of representation to use
+            - :param: `no_idf` (bool): do not use idf weighting
+            - :param: `batch_size` (int): bert score processing batch size
+            - :param: `cache` (EmbeddingCache or str): embedding cache or path to one
+        """
+        assert bert in bert_types
+        self.bert = bert
+        self.num_layers = num_layers
+        self.no_idf = no_idf
+        self.batch_size = batch_size
+        self.cache = EmbeddingCache(cache) if isinstance(cache, str) else cache
+        self._idf_cache = OrderedDict()
+
+    @property
+    def model_id(self):
+        return f"{self.bert}:{self.num_layers}"
+
+    def embed(self, sentences):
+        """
+        Compute token embeddings of unique sentences.
+        Args:
+            - :param: `sentences` (list of str): sentences to encode
+        Returns a dict mapping each sentence to a (token ids, embedding tensor of shape [len(ids), d]) pair.
+        """
+        sentences = list(dict.fromkeys(sentences))
+        embeddings = {}
+
+        if self.cache is not None:
+            keys = {
+                sentence: self.cache.key(self.model_id, sentence)
+                for sentence in sentences
+            }
+            found = self.cache.get_many(list(keys.values()))
+            for sentence, key in keys.items():
+                if key in found:
+                    ids, embedding = found[key]
+                    embeddings[sentence] = (ids, torch.from_numpy(embedding.copy()))
+
+        missing = [sentence for sentence in sentences if sentence not in embeddings]
+
+        if missing:
+            tokenizer, model, device = get_model(self.bert, self.num_layers)
+            ids = dict(zip(missing, encode(missing, tokenizer)))
+            pad_token = tokenizer.pad_token_id
+            # batch sentences of similar length together to minimize padding
+            missing.sort(key=lambda sentence: len(ids[sentence]))
+
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start : start + self.batch_size]
+                padded, lens, mask = padding(
+                    [ids[sentence] for sentence in batch], pad_token
+                )
+                batch_embedding = bert_encode(
+                    model, padded.to(device), attention_mask=mask.to(device)
+                ).cpu()
+                for i, sentence in enumerate(batch):
+                    embeddings[sentence] = (
+                        ids[sentence],
+                        batch_embedding[i, : lens[i]].clone(),
+                    )
+
+            if self.cache is not None:
+                self.cache.set_many(
+                    [(keys[sentence], *embeddings[sentence]) for sentence in missing]
+                )
+
+        return embeddings
+
+    def idf(self, refs):
+        """
+        Inverse document frequencies of all word piece indices over a reference set.
+        Weights of the most recently used reference sets are cached.
+        Args:
+            - :param: `refs` (list of str): reference sentences
+        Returns an array of weights indexed by word piece index.
+        """
+        tokenizer = get_tokenizer(self.bert)
+
+        if self.no_idf:
+            return self._uniform_idf()
+
+        key = hashlib.sha256(json.dumps(refs).encode("utf-8")).hexdigest()
+
+        if key in self._idf_cache:
+            self._idf_cache.move_to_end(key)
+        else:
+            self._idf_cache[key] = get_idf_weights(refs, tokenizer)
+            if len(self._idf_cache) > IDF_CACHE_SIZE:
+                self._idf_cache.popitem(last=False)
+
+        return self._idf_cache[key]
+
+    def _uniform_idf(self):
+        tokenizer = get_tokenizer(self.bert)
+        weights = np.ones(len(tokenizer))
         # set idf for [SEP] and [CLS] to 0
-        idf_dict[101] = 0
-        idf_dict[102] = 0
-    else:
-        idf_dict = get_idf_dict(refs, tokenizer)
+        weights[[tokenizer.cls_token_id, tokenizer.sep_token_id]] = 0
+        return weights
+
+    def document_frequency(self, refs):
+        """
+        Number of reference sentences each word piece index occurs in.
+        Frequencies of disjoint reference sets can be summed.
+        Args:
+            - :param: `refs` (list of str): reference sentences
+        Returns an array of counts indexed by word piece index.
+        """
+        tokenizer = get_tokenizer(self.bert)
+        return document_frequency(encode(refs, tokenizer), len(tokenizer))
+
+    def idf_from_frequency(self, df, num_docs):
+        """
+        Inverse document frequencies from (accumulated) document frequencies,
+        same as `idf` on the union of the reference sets.
+        Args:
+            - :param: `df` (np.ndarray): document frequency of each word piece index
+            - :param: `num_docs` (int): number of reference sentences
+        Returns an array of weights indexed by word piece index.
+        """
+        if self.no_idf:
+            return self._uniform_idf()
+        return np.log((num_docs + 1) / (df + 1))
+
+    def greedy_match(self, cands, refs):
+        """
+        Greedy cosine matching of candidate-reference pairs before idf weighting,
+        so that pairs can be scored later with idf weights of a larger reference set.
+        Args:
+            - :param: `cands` (list of str): candidate sentences
+            - :param: `refs` (list of str): reference sentences
+        Returns a list of (candidate ids, candidate similarities, reference ids, reference similarities)
+        numpy array tuples, one per pair.
+        """
+        assert len(cands) == len(refs)
+
+        embeddings = self.embed(cands + refs)
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        matches = []
+
+        for start in range(0, len(refs), self.batch_size):
+            batch_refs = refs[start : start + self.batch_size]
+            batch_cands = cands[start : start + self.batch_size]
+            ref_embedding, ref_lens, ref_mask, _ = _collate(
+                embeddings, batch_refs, None, device
+            )
+            hyp_embedding, hyp_lens, hyp_mask, _ = _collate(
+                embeddings, batch_cands, None, device
+            )
+            word_precision, word_recall = greedy_cos(
+                ref_embedding, ref_mask, hyp_embedding, hyp_mask
+            )
+            word_precision = word_precision.cpu().numpy()
+            word_recall = word_recall.cpu().numpy()
+
+            for i, (cand, ref) in enumerate(zip(batch_cands, batch_refs)):
+                matches.append(
+                    (
+                        np.asarray(embeddings[cand][0], dtype=np.int64),
+                        word_precision[i, : int(hyp_lens[i])].copy(),
+                        np.asarray(embeddings[ref][0], dtype=np.int64),
+                        word_recall[i, : int(ref_lens[i])].copy(),
+                    )
+                )
 
-    all_preds = bert_cos_score_idf(
-        model, refs, cands, tokenizer, idf_dict, device=device, batch_size=batch_size
+        return matches
+
+    @staticmethod
+    def score_matches(matches, idf):
+        """
+        BERTScore of pairs matched with `greedy_match`.
+        Args:
+            - :param: `matches` (list of tuple): matches returned by `greedy_match`
+            - :param: `idf` (np.ndarray): idf weights indexed by word piece index
+        Returns precision, recall and F1 arrays.
+        """
+        P = np.array(
+            [np.dot(idf[ids], sims) / idf[ids].sum() for ids, sims, _, _ in matches]
+        )
+        R = np.array(
+            [np.dot(idf[ids], sims) / idf[ids].sum() for _, _, ids, sims in matches]
+        )
+        F = 2 * P * R / (P + R)
+        return P, R, F
+
+    def score(self, cands, refs):
+        """
+        BERTScore of candidate-reference pairs.
+        Args:
+            - :param: `cands` (list of str): candidate sentences
+            - :param: `refs` (list of str): reference sentences
+        Returns precision, recall and F1 tensors.
+        """
+        assert len(cands) == len(refs)
+
+        idf = self.idf(refs)
+        embeddings = self.embed(cands + refs)
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+
+        preds = []
+        for start in range(0, len(refs), self.batch_size):
+            ref_stats = _collate(
+                embeddings, refs[start : start + self.batch_size], idf, device
+            )
+            hyp_stats = _collate(
+                embeddings, cands[start : start + self.batch_size], idf, device
+            )
+            P, R, F1 = greedy_cos_idf(*ref_stats, *hyp_stats)
+            preds.append(torch.stack((P, R, F1), dim=1).cpu())
+
+        all_preds = torch.cat(preds, dim=0)
+        return all_preds[:, 0], all_preds[:, 1], all_preds[:, 2]
+
+
+def _collate(embeddings, sentences, idf, device):
+    padded_ids, lens, mask = padding(
+        [embeddings[sentence][0] for sentence in sentences], 0
     )
+    dim = embeddings[sentences[0]][1].size(-1)
+    # pad with ones instead of zeros so that padded tokens have a well-defined norm,
+    # they are masked out of the similarity matrix
+    padded = torch.ones(len(sentences), padded_ids.size(1), dim)
+    padded[mask.bool()] = torch.cat([embeddings[sentence][1] for sentence in sentences])
+    padded_idf = idf_weights(padded_ids, mask, idf) if idf is not None else None
+    return padded.to(device), lens.to(device), mask.to(device), padded_idf
 
-    P = all_preds[:, 0].cpu()
-    R = all_preds[:, 1].cpu()
-    F1 = all_preds[:, 2].cpu()
 
-    return P, R, F1
+def score(
+    cands,
+    refs,
+    bert="bert-base-multilingual-cased",
+    num_layers=8,
+    no_idf=False,
+    batch_size=64,
+):
+    """
+    BERTScore metric.
+    Args:
+        - :param: `cands` (list of str): candidate sentences
+        - :param: `refs` (list of str): reference sentences
+        - :param: `bert` (str): bert specification
+        - :param: `num_layers` (int): the layer of representation to use
+        - :param: `verbose` (bool): turn on intermediate status update
+        - :param: `no_idf` (bool): do not use idf weighting
+        - :param: `batch_size` (int): bert score processing batch size
+    """
+    scorer = BertScorer(
+        bert=bert, num_layers=num_layers, no_idf=no_idf, batch_size=batch_size
+    )
+    return scorer.score(cands, refs)
@@ -1,9 +1,8 @@
 import torch
+import numpy as np
 from math import log
 from itertools import chain
-from collections import defaultdict, Counter
-from multiprocessing import Pool
-from functools import partial
+from collections import defaultdict
 from tqdm.auto import tqdm
 
 __all__ = ["bert_types"]
@@ -22,11 +21,11 @@ bert_types = [
 def padding(arr, pad_token, dtype=torch.long):
     lens = torch.LongTensor([len(a) for a in arr])
     max_len = lens.max().item()
-    padded = torch.ones(len(arr), max_len, dtype=dtype) * pad_token
-    mask = torch.zeros(len(arr), max_len, dtype=torch.long)
-    for i, a in enumerate(arr):
-        padded[i, : lens[i]] = torch.tensor(a, dtype=dtype)
-        mask[i, : lens[i]] = 1
+    positions = torch.arange(max_len).unsqueeze(0) < lens.unsqueeze(1)
+    padded = torch.full((len(arr), max_len), pad_token, dtype=dtype)
+    # fill all rows at once, positions are in row-major order
+    padded[positions] = torch.tensor(list(chain.from_iterable(arr)), dtype=dtype)
+    mask = positions.long()
     return padded, lens, mask
 
 
@@ -37,11 +36,46 @@ def bert_encode(model, x, attention_mask):
     return x_encoded_layers
 
 
-def process(a, tokenizer=None):
-    if tokenizer is not None:
-        a = ["[CLS]"] + tokenizer.tokenize(a) + ["[SEP]"]
-        a = tokenizer.convert_tokens_to_ids(a)
-    return set(a)
+def encode(arr, tokenizer):
+    """
+    Returns word piece indices of sentences with [CLS] and [SEP] added.
+    Fast tokenizers encode all sentences in a single batched call.
+    Args:
+        - :param: `arr` (list of str) : sentences to process.
+        - :param: `tokenizer` : a BERT tokenizer corresponds to `model`.
+    """
+    if getattr(tokenizer, "is_fast", False):
+        return tokenizer(list(arr), add_special_tokens=True)["input_ids"]
+    return [
+        tokenizer.convert_tokens_to_ids(["[CLS]"] + tokenizer.tokenize(a) + ["[SEP]"])
+        for a in arr
+    ]
+
+
+def document_frequency(ids, vocab_size):
+    """
+    Returns the number of sentences each word piece index occurs in.
+    Args:
+        - :param: `ids` (list of list of int) : word piece indices of each sentence.
+        - :param: `vocab_size` (int) : size of the vocabulary.
+    """
+    docs = np.repeat(np.arange(len(ids), dtype=np.int64), [len(a) for a in ids])
+    occurrences = np.unique(
+        docs * vocab_size + np.fromiter(chain.from_iterable(ids), dtype=np.int64)
+    )
+    return np.bincount(occurrences % vocab_size, minlength=vocab_size)
+
+
+def get_idf_weights(arr, tokenizer):
+    """
+    Returns the inverse document frequency of every word piece index as an array,
+    usable to look up weights of padded index tensors at once.
+    Args:
+        - :param: `arr` (list of str) : sentences to process.
+        - :param: `tokenizer` : a BERT tokenizer corresponds to `model`.
+    """
+    df = document_frequency(encode(arr, tokenizer), len(tokenizer))
+    return np.log((len(arr) + 1) / (df + 1))
 
 
 def get_idf_dict(arr, tokenizer, nthreads=4):
@@ -50,19 +84,17 @@ def get_idf_dict(arr, tokenizer, nthreads=4):
     Args:
         - :param: `arr` (list of str) : sentences to process.
         - :param: `tokenizer` : a BERT tokenizer corresponds to `model`.
-        - :param: `nthreads` (int) : number of CPU threads to use
+        - :param: `nthreads` (int) : unused, sentences are tokenized in batch instead of in a process pool
     """
-    idf_count = Counter()
     num_docs = len(arr)
-
-    process_partial = partial(process, tokenizer=tokenizer)
-
-    with Pool(nthreads) as p:
-        idf_count.update(chain.from_iterable(p.map(process_partial, arr)))
+    df = document_frequency(encode(arr, tokenizer), len(tokenizer))
 
     idf_dict = defaultdict(lambda: log((num_docs + 1) / (1)))
     idf_dict.update(
-        {idx: log((num_docs + 1) / (c + 1)) for (idx, c) in idf_count.items()}
+        {
+            idx: log((num_docs + 1) / (df[idx] + 1))
+            for idx in np.flatnonzero(df).tolist()
+        }
     )
     return idf_dict
 
@@ -77,20 +109,25 @@ def collate_idf(arr, tokenize, numericalize, idf_dict, pad="[PAD]", device="cuda
                   of tokens.
         - :param: `numericalize` : a function that takes a list of tokens and
                   return list of token indexes.
-        - :param: `idf_dict` (dict): mapping a word piece index to its
-                               inverse document frequency
+        - :param: `idf_dict` (dict or np.ndarray): mapping a word piece index to its
+                               inverse document frequency, or an array of
+                               inverse document frequencies of all indices
         - :param: `pad` (str): the padding token.
         - :param: `device` (str): device to use, e.g. 'cpu' or 'cuda'
     """
     arr = [["[CLS]"] + tokenize(a) + ["[SEP]"] for a in arr]
     arr = [numericalize(a) for a in arr]
 
-    idf_weights = [[idf_dict[i] for i in a] for a in arr]
-
     pad_token = numericalize([pad])[0]
 
     padded, lens, mask = padding(arr, pad_token, dtype=torch.long)
-    padded_idf, _, _ = padding(idf_weights, pad_token, dtype=torch.float)
+
+    if isinstance(idf_dict, np.ndarray):
+        # look up the weights of all tokens at once, padded tokens get a zero weight
+        padded_idf = idf_weights(padded, mask, idf_dict)
+    else:
+        idf_weights_list = [[idf_dict[i] for i in a] for a in arr]
+        padded_idf, _, _ = padding(idf_weights_list, pad_token, dtype=torch.float)
 
     padded = padded.to(device=device)
     mask = mask.to(device=device)
@@ -98,6 +135,17 @@ def collate_idf(arr, tokenize, numericalize, idf_dict, pad="[PAD]", device="cuda
     return padded, padded_idf, lens, mask
 
 
+def idf_weights(padded, mask, idf):
+    """
+    Returns inverse document frequency weights of padded word piece indices.
+    Args:
+        - :param: `padded` (torch.LongTensor): padded word piece indices
+        - :param: `mask` (torch.LongTensor): mask of non-padded positions
+        - :param: `idf` (np.ndarray): inverse document frequencies of all indices
+    """
+    return torch.from_numpy(idf[padded.cpu().numpy()]).float() * mask.cpu().float()
+
+
 def get_bert_embedding(
     all_sens, model, tokenizer, idf_dict, batch_size=-1, device="cuda:0"
 ):
@@ -140,6 +188,37 @@ def get_bert_embedding(
     return total_embedding, lens, mask, padded_idf
 
 
+def greedy_cos(ref_embedding, ref_masks, hyp_embedding, hyp_masks):
+    """
+    Compute greedy matching based on cosine similarity, before idf weighting.
+    Args:
+        - :param: `ref_embedding` (torch.Tensor): embeddings of reference sentences, BxKxd
+        - :param: `ref_masks` (torch.LongTensor): BxK, BERT attention mask for reference sentences
+        - :param: `hyp_embedding` (torch.Tensor): embeddings of candidate sentences, BxKxd
+        - :param: `hyp_masks` (torch.LongTensor): BxK, BERT attention mask for candidate sentences
+    Returns the best similarity of each candidate word piece and of each reference word piece.
+    """
+
+    ref_embedding.div_(torch.norm(ref_embedding, dim=-1).unsqueeze(-1))
+    hyp_embedding.div_(torch.norm(hyp_embedding, dim=-1).unsqueeze(-1))
+
+    batch_size = ref_embedding.size(0)
+
+    sim = torch.bmm(hyp_embedding, ref_embedding.transpose(1, 2))
+    masks = torch.bmm(hyp_masks.unsqueeze(2).float(), ref_masks.unsqueeze(1).float())
+    masks = (
+        masks.expand(batch_size, masks.size(1), masks.size(2)).contiguous().view_as(sim)
+    )
+
+    masks = masks.float().to(sim.device)
+    sim = sim * masks
+
+    word_precision = sim.max(dim=2)[0]
+    word_recall = sim.max(dim=1)[0]
+
+    return word_precision, word_recall
+
+
 def greedy_cos_idf(
     ref_embedding,
     ref_lens,
@@ -171,23 +250,10 @@ def greedy_cos_idf(
                    piece in the candidate setence
     """
 
-    ref_embedding.div_(torch.norm(ref_embedding, dim=-1).unsqueeze(-1))
-    hyp_embedding.div_(torch.norm(hyp_embedding, dim=-1).unsqueeze(-1))
-
-    batch_size = ref_embedding.size(0)
-
-    sim = torch.bmm(hyp_embedding, ref_embedding.transpose(1, 2))
-    masks = torch.bmm(hyp_masks.unsqueeze(2).float(), ref_masks.unsqueeze(1).float())
-    masks = (
-        masks.expand(batch_size, masks.size(1), masks.size(2)).contiguous().view_as(sim)
+    word_precision, word_recall = greedy_cos(
+        ref_embedding, ref_masks, hyp_embedding, hyp_masks
     )
 
-    masks = masks.float().to(sim.device)
-    sim = sim * masks
-
-    word_precision = sim.max(dim=2)[0]
-    word_recall = sim.max(dim=1)[0]
-
     hyp_idf.div_(hyp_idf.sum(dim=1, keepdim=True))
     ref_idf.div_(ref_idf.sum(dim=1, keepdim=True))
     precision_scale = hyp_idf.to(word_precision.device)
@@ -9,6 +9,7 @@
 # Authors : Hao Fang <hfang@uw.edu> and Tsung-Yi Lin <tl483@cornell.edu>
 
 from kogito.evaluation.bleu.bleu_scorer import BleuScorer
+from kogito.evaluation.ngrams import NgramFeaturizer
 
 
 class Bleu:
@@ -18,11 +19,21 @@ class Bleu:
         self._hypo_for_image = {}
         self.ref_for_image = {}
 
-    def compute_score(self, gts, res):
+    def compute_score(self, gts, res, featurizer=None):
+        return self.score_cooked(self.cook(gts, res, featurizer=featurizer))
+
+    def cook(self, gts, res, featurizer=None):
+        """Collects the corpus statistics of the given sentences in a BleuScorer.
+        Scorers cooked from disjoint shards can be merged with ``+=``.
+        An NgramFeaturizer can be shared with other metrics to count n-grams of each sentence once.
+        """
 
         assert gts.keys() == res.keys()
         imgIds = gts.keys()
 
+        if featurizer is None or featurizer.n != self._n:
+            featurizer = NgramFeaturizer(n=self._n)
+
         bleu_scorer = BleuScorer(n=self._n)
         for id in imgIds:
             hypo = res[id]
@@ -34,8 +45,11 @@ class Bleu:
             assert type(ref) is list
             assert len(ref) >= 1
 
-            bleu_scorer += (hypo[0], ref)
+            bleu_scorer.cook_append(hypo[0], ref, featurizer=featurizer)
+
+        return bleu_scorer
 
+    def score_cooked(self, bleu_scorer):
         # score, scores = bleu_scorer.compute_score(option='shortest')
         score, scores = bleu_scorer.compute_score(option="closest", verbose=0)
         # score, scores = bleu_scorer.compute_score(option='average', verbose=0)
@@ -35,15 +35,21 @@ def precook(s, n=4, out=False):
     return (len(words), counts)
 
 
-def cook_refs(refs, eff=None, n=4):  # lhuang: oracle will call with "average"
+def cook_refs(
+    refs, eff=None, n=4, featurizer=None
+):  # lhuang: oracle will call with "average"
     """Takes a list of reference sentences for a single segment
     and returns an object that encapsulates everything that BLEU
-    needs to know about them."""
+    needs to know about them. A shared NgramFeaturizer can be given
+    to reuse n-gram counts of already seen sentences."""
 
     reflen = []
     maxcounts = {}
     for ref in refs:
-        rl, counts = precook(ref, n)
+        if featurizer is not None:
+            rl, counts = featurizer.precook(ref)
+        else:
+            rl, counts = precook(ref, n)
         reflen.append(rl)
         for (ngram, count) in counts.items():
             maxcounts[ngram] = max(maxcounts.get(ngram, 0), count)
@@ -61,12 +67,15 @@ def cook_refs(refs, eff=None, n=4):  # lhuang: oracle will call with "average"
     return (reflen, maxcounts)
 
 
-def cook_test(test, tup, eff=None, n=4):
+def cook_test(test, tup, eff=None, n=4, featurizer=None):
     """Takes a test sentence and returns an object that
     encapsulates everything that BLEU needs to know about it."""
 
     (reflen, refmaxcounts) = tup
-    testlen, counts = precook(test, n, True)
+    if featurizer is not None:
+        testlen, counts = featurizer.precook(test)
+    else:
+        testlen, counts = precook(test, n, True)
 
     result = {}
 
@@ -120,13 +129,16 @@ class BleuScorer(object):
         self.cook_append(test, refs)
         self.special_reflen = special_reflen
 
-    def cook_append(self, test, refs):
+    def cook_append(self, test, refs, featurizer=None):
         """called by constructor and __iadd__ to avoid creating new instances."""
 
+        if featurizer is not None:
+            assert featurizer.n == self.n, "incompatible n-gram featurizer."
+
         if refs is not None:
-            self.crefs.append(cook_refs(refs))
+            self.crefs.append(cook_refs(refs, featurizer=featurizer))
             if test is not None:
-                cooked_test = cook_test(test, self.crefs[-1])
+                cooked_test = cook_test(test, self.crefs[-1], featurizer=featurizer)
                 self.ctest.append(cooked_test)  # N.B.: -1
             else:
                 self.ctest.append(None)  # lens of crefs and ctest have to match
@@ -0,0 +1,208 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from kogito.evaluation.bleu.bleu_scorer import BleuScorer
+
+
+class _MeanColumn:
+    """Scores averaged over items"""
+
+    def __init__(self, names: List[str], scores: np.ndarray) -> None:
+        # scores: (num names, num items)
+        self.names = names
+        self.scores = scores
+
+    def reduce(self, weights: np.ndarray, index: np.ndarray) -> Dict[str, np.ndarray]:
+        values = self.scores[:, index] @ weights.T / weights.sum(axis=1)
+        return dict(zip(self.names, values))
+
+
+class _BleuColumn:
+    """Corpus BLEU from per-item length and n-gram match statistics"""
+
+    def __init__(self, names: List[str], bleu_scorer: BleuScorer) -> None:
+        self.names = names
+        self.testlen = np.array(
+            [comps["testlen"] for comps in bleu_scorer.ctest], dtype=np.float64
+        )
+        self.reflen = np.array(
+            [
+                bleu_scorer._single_reflen(comps["reflen"], "closest", comps["testlen"])
+                for comps in bleu_scorer.ctest
+            ],
+            dtype=np.float64,
+        )
+        self.guess = np.array(
+            [comps["guess"] for comps in bleu_scorer.ctest], dtype=np.float64
+        )
+        self.correct = np.array(
+            [comps["correct"] for comps in bleu_scorer.ctest], dtype=np.float64
+        )
+
+    def reduce(self, weights: np.ndarray, index: np.ndarray) -> Dict[str, np.ndarray]:
+        # same computation as BleuScorer.compute_score, vectorized over weightings
+        small = 1e-9
+        tiny = 1e-15
+        testlen = weights @ self.testlen[index]
+        reflen = weights @ self.reflen[index]
+        guess = weights @ self.guess[index]
+        correct = weights @ self.correct[index]
+        n = guess.shape[1]
+        bleus = np.cumprod((correct + tiny) / (guess + small), axis=1) ** (
+            1.0 / np.arange(1, n + 1)
+        )
+        ratio = (testlen + tiny) / (reflen + small)
+        brevity_penalty = np.exp(1 - 1 / np.maximum(ratio, tiny))
+        bleus *= np.where(ratio < 1, brevity_penalty, 1.0)[:, None]
+        return dict(zip(self.names, bleus.T))
+
+
+class ScoreBreakdown:
+    """
+    Per-item scores of an evaluation with grouped aggregates and bootstrap confidence intervals.
+    Aggregates are weighted reductions over per-item arrays, so no generation or scoring is rerun.
+    """
+
+    def __init__(
+        self, columns: List[Any], groups: Dict[str, List[Any]], size: int
+    ) -> None:
+        """Initialize a score breakdown
+
+        Args:
+            columns (List[Any]): Per-item score columns
+            groups (Dict[str, List[Any]]): Group labels of each item by grouping name
+            size (int): Number of items
+        """
+        self.columns = columns
+        self.groups = {name: np.asarray(labels) for name, labels in groups.items()}
+        self.size = size
+
+    @classmethod
+    def from_evaluator(
+        cls, evaluator, groups: Optional[Dict[str, List[Any]]] = None
+    ) -> "ScoreBreakdown":
+        """Build a breakdown from an evaluated ``Evaluator``
+
+        Args:
+            evaluator (Evaluator): Evaluator after ``evaluate`` has been called
+            groups (Optional[Dict[str, List[Any]]], optional): Group labels of each item (in key order)
+                by grouping name. Defaults to None.
+
+        Returns:
+            ScoreBreakdown: Score breakdown
+        """
+        columns = []
+
+        for metric, method in zip(evaluator.metrics, evaluator.methods):
+            names = method if isinstance(method, list) else [method]
+            cooked = evaluator.cooked.get(metric)
+
+            if isinstance(cooked, BleuScorer):
+                columns.append(_BleuColumn(names, cooked))
+            else:
+                _, scores = evaluator.results[metric]
+                scores = np.asarray(scores, dtype=np.float64).reshape(len(names), -1)
+                columns.append(_MeanColumn(names, scores))
+
+        return cls(columns, groups or {}, len(evaluator.gts))
+
+    def _reduce(self, weights: np.ndarray, index: np.ndarray) -> Dict[str, np.ndarray]:
+        values = {}
+        for column in self.columns:
+            values.update(column.reduce(weights, index))
+        return values
+
+    def _group_indices(self, by: Optional[str]) -> Dict[Any, np.ndarray]:
+        if by is None:
+            return {"all": np.arange(self.size)}
+
+        if by not in self.groups:
+            raise ValueError(
+                f"Unknown grouping: {by}. Available groupings: {list(self.groups)}"
+            )
+
+        labels, inverse = np.unique(self.groups[by], return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.cumsum(np.bincount(inverse, minlength=len(labels)))[:-1]
+        return {
+            label.item() if hasattr(label, "item") else label: index
+            for label, index in zip(labels, np.split(order, bounds))
+        }
+
+    def aggregate(self, by: Optional[str] = None) -> Dict[Any, Dict[str, float]]:
+        """Aggregate scores over all items or per group
+
+        Args:
+            by (Optional[str], optional): Grouping name, e.g. "relation", "head_type" or "k".
+                If None, scores are aggregated over all items. Defaults to None.
+
+        Returns:
+            Dict[Any, Dict[str, float]]: Scores by group label
+        """
+        group_indices = self._group_indices(by)
+        labels = list(group_indices)
+        index = np.concatenate([group_indices[label] for label in labels])
+        weights = np.zeros((len(labels), len(index)))
+        start = 0
+
+        for row, label in enumerate(labels):
+            size = len(group_indices[label])
+            weights[row, start : start + size] = 1.0
+            start += size
+
+        values = self._reduce(weights, index)
+
+        return {
+            label: {name: float(value[row]) for name, value in values.items()}
+            for row, label in enumerate(labels)
+        }
+
+    def confidence_intervals(
+        self,
+        by: Optional[str] = None,
+        num_samples: int = 1000,
+        confidence: float = 0.95,
+        seed: Optional[int] = None,
+        chunk_size: int = 100,
+    ) -> Dict[Any, Dict[str, Tuple[float, float]]]:
+        """Compute percentile bootstrap confidence intervals over all items or per group.
+        Bootstrap samples are represented as item counts and reduced in chunks of
+        ``chunk_size`` samples at once.
+
+        Args:
+            by (Optional[str], optional): Grouping name. If None, intervals are computed
+                over all items. Defaults to None.
+            num_samples (int, optional): Number of bootstrap samples. Defaults to 1000.
+            confidence (float, optional): Confidence level. Defaults to 0.95.
+            seed (Optional[int], optional): Random seed. Defaults to None.
+            chunk_size (int, optional): Number of bootstrap samples reduced at once. Defaults to 100.
+
+        Returns:
+            Dict[Any, Dict[str, Tuple[float, float]]]: (lower, upper) bounds by group label and score name
+        """
+        rng = np.random.default_rng(seed)
+        percentiles = [100 * (1 - confidence) / 2, 100 * (1 + confidence) / 2]
+        intervals = {}
+
+        for label, index in self._group_indices(by).items():
+            samples: Dict[str, List[np.ndarray]] = {}
+
+            for start in range(0, num_samples, chunk_size):
+                weights = rng.multinomial(
+                    len(index),
+                    np.full(len(index), 1.0 / len(index)),
+                    size=min(chunk_size, num_samples - start),
+                ).astype(np.float64)
+                for name, values in self._reduce(weights, index).items():
+                    samples.setdefault(name, []).append(values)
+
+            intervals[label] = {
+                name: tuple(
+                    float(bound)
+                    for bound in np.percentile(np.concatenate(values), percentiles)
+                )
+                for name, values in samples.items()
+            }
+
+        return intervals
@@ -8,6 +8,7 @@
 # Authors: Ramakrishna Vedantam <vrama91@vt.edu> and Tsung-Yi Lin <tl483@cornell.edu>
 
 from kogito.evaluation.cider.cider_scorer import CiderScorer
+from kogito.evaluation.ngrams import NgramFeaturizer
 
 
 class Cider:
@@ -16,26 +17,43 @@ class Cider:
 
     """
 
-    def __init__(self, test=None, refs=None, n=4, sigma=6.0):
+    def __init__(self, test=None, refs=None, n=4, sigma=6.0, vectorized=True):
         # set cider to sum over 1 to 4-grams
         self._n = n
         # set the standard deviation parameter for gaussian penalty
         self._sigma = sigma
+        # use the sparse NumPy implementation instead of per-pair Python loops
+        self._vectorized = vectorized
 
-    def compute_score(self, gts, res):
+    def compute_score(self, gts, res, featurizer=None):
         """
         Main function to compute CIDEr score
         :param  hypo_for_image (dict) : dictionary with key <image> and value
                     <tokenized hypothesis / candidate sentence>
                 ref_for_image (dict)  : dictionary with key <image> and value
                     <tokenized reference sentence>
+                featurizer (NgramFeaturizer) : n-gram featurizer shared with other metrics
         :return: cider (float) : computed CIDEr score for the corpus
         """
+        return self.score_cooked(self.cook(gts, res, featurizer=featurizer))
+
+    def cook(self, gts, res, featurizer=None):
+        """
+        Collects n-gram counts of the given sentences in a CiderScorer.
+        Scorers cooked from disjoint shards can be merged with ``+=``, document frequencies
+        are computed over the merged corpus.
+        :return: cider_scorer (CiderScorer) : scorer with cooked hypotheses and references
+        """
 
         assert gts.keys() == res.keys()
         imgIds = gts.keys()
 
-        cider_scorer = CiderScorer(n=self._n, sigma=self._sigma)
+        if featurizer is None or featurizer.n != self._n:
+            featurizer = NgramFeaturizer(n=self._n)
+
+        cider_scorer = CiderScorer(
+            n=self._n, sigma=self._sigma, vectorized=self._vectorized
+        )
 
         for id in imgIds:
             hypo = res[id]
@@ -47,9 +65,12 @@ class Cider:
             assert type(ref) is list
             assert len(ref) > 0
 
-            cider_scorer += (hypo[0], ref)
+            cider_scorer.cook_append(hypo[0], ref, featurizer=featurizer)
+
+        return cider_scorer
 
-        (score, scores) = cider_scorer.compute_score()
+    def score_cooked(self, cider_scorer):
+        score, scores = cider_scorer.compute_score()
 
         return score, scores
 
@@ -27,24 +27,30 @@ def precook(s, n=4, out=False):
 
 
 # lhuang: oracle will call with "average"
-def cook_refs(refs, n=4):
+def cook_refs(refs, n=4, featurizer=None):
     """Takes a list of reference sentences for a single segment
     and returns an object that encapsulates everything that BLEU
     needs to know about them.
     :param refs: list of string : reference sentences for some image
     :param n: int : number of ngrams for which (ngram) representation is calculated
+    :param featurizer: NgramFeaturizer : shared featurizer to reuse n-gram counts of seen sentences
     :return: result (list of dict)
     """
+    if featurizer is not None:
+        return [featurizer.precook(ref)[1] for ref in refs]
     return [precook(ref, n) for ref in refs]
 
 
-def cook_test(test, n=4):
+def cook_test(test, n=4, featurizer=None):
     """Takes a test sentence and returns an object that
     encapsulates everything that BLEU needs to know about it.
     :param test: list of string : hypothesis sentence for some image
     :param n: int : number of ngrams for which (ngram) representation is calculated
+    :param featurizer: NgramFeaturizer : shared featurizer to reuse n-gram counts of seen sentences
     :return: result (dict)
     """
+    if featurizer is not None:
+        return featurizer.precook(test)[1]
     return precook(test, n, True)
 
 
@@ -53,28 +59,32 @@ class CiderScorer(object):
 
     def copy(self):
         """copy the refs."""
-        new = CiderScorer(n=self.n)
+        new = CiderScorer(n=self.n, sigma=self.sigma, vectorized=self.vectorized)
         new.ctest = copy.copy(self.ctest)
         new.crefs = copy.copy(self.crefs)
         return new
 
-    def __init__(self, test=None, refs=None, n=4, sigma=6.0):
+    def __init__(self, test=None, refs=None, n=4, sigma=6.0, vectorized=True):
         """singular instance"""
         self.n = n
         self.sigma = sigma
+        self.vectorized = vectorized
         self.crefs = []
         self.ctest = []
         self.document_frequency = defaultdict(float)
         self.cook_append(test, refs)
         self.ref_len = None
 
-    def cook_append(self, test, refs):
+    def cook_append(self, test, refs, featurizer=None):
         """called by constructor and __iadd__ to avoid creating new instances."""
 
+        if featurizer is not None:
+            assert featurizer.n == self.n, "incompatible n-gram featurizer."
+
         if refs is not None:
-            self.crefs.append(cook_refs(refs))
+            self.crefs.append(cook_refs(refs, featurizer=featurizer))
             if test is not None:
-                self.ctest.append(cook_test(test))  # N.B.: -1
+                self.ctest.append(cook_test(test, featurizer=featurizer))  # N.B.: -1
             else:
                 self.ctest.append(None)  # lens of crefs and ctest have to match
 
@@ -122,7 +132,7 @@ class CiderScorer(object):
             vec = [defaultdict(float) for _ in range(self.n)]
             length = 0
             norm = [0.0 for _ in range(self.n)]
-            for (ngram, term_freq) in cnts.items():
+            for ngram, term_freq in cnts.items():
                 # give word count 1 if it doesn't appear in reference corpus
                 df = np.log(max(1.0, self.document_frequency[ngram]))
                 # ngram index
@@ -153,7 +163,7 @@ class CiderScorer(object):
             val = np.array([0.0 for _ in range(self.n)])
             for n in range(self.n):
                 # ngram
-                for (ngram, count) in vec_hyp[n].items():
+                for ngram, count in vec_hyp[n].items():
                     # vrama91 : added clipping
                     val[n] += (
                         min(vec_hyp[n][ngram], vec_ref[n][ngram]) * vec_ref[n][ngram]
@@ -189,7 +199,97 @@ class CiderScorer(object):
             scores.append(score_avg)
         return scores
 
+    def compute_cider_vectorized(self):
+        """
+        Compute CIDEr scores for all hypotheses at once.
+        N-grams are mapped to integer ids and tf-idf vectors of all hypotheses and references
+        are stored as flat sparse (sentence, ngram, value) arrays, so that document frequencies,
+        norms and clipped cosine similarities are computed with NumPy instead of Python loops.
+        Gives the same scores as compute_cider up to floating point rounding (differences of about 1e-15),
+        since sums are accumulated in a different order.
+        :return: scores (np.ndarray) : CIDEr score for each hypothesis
+        """
+        num_tests = len(self.ctest)
+        ref_counts = np.array([len(refs) for refs in self.crefs], dtype=np.int64)
+        ref_tests = np.repeat(np.arange(num_tests, dtype=np.int64), ref_counts)
+        num_refs = len(ref_tests)
+
+        ngram_ids = {}
+        hyp_entries = _sparse_entries(self.ctest, ngram_ids)
+        ref_entries = _sparse_entries(
+            [ref for refs in self.crefs for ref in refs], ngram_ids
+        )
+        hyp_sents, hyp_ngrams, hyp_orders, hyp_tfs = hyp_entries
+        ref_sents, ref_ngrams, ref_orders, ref_tfs = ref_entries
+        vocab_size = max(len(ngram_ids), 1)
+
+        # document frequency: number of tests whose references contain the ngram
+        test_ngrams = np.unique(ref_tests[ref_sents] * vocab_size + ref_ngrams)
+        document_frequency = np.bincount(
+            test_ngrams % vocab_size, minlength=vocab_size
+        ).astype(np.float64)
+        self.ref_len = np.log(float(len(self.crefs)))
+        idf = self.ref_len - np.log(np.maximum(1.0, document_frequency))
+
+        hyp_values = hyp_tfs * idf[hyp_ngrams]
+        ref_values = ref_tfs * idf[ref_ngrams]
+
+        hyp_norms = _norms(hyp_sents, hyp_orders, hyp_values, num_tests, self.n)
+        ref_norms = _norms(ref_sents, ref_orders, ref_values, num_refs, self.n)
+        hyp_lengths = np.bincount(
+            hyp_sents, weights=hyp_tfs * (hyp_orders == 1), minlength=num_tests
+        )
+        ref_lengths = np.bincount(
+            ref_sents, weights=ref_tfs * (ref_orders == 1), minlength=num_refs
+        )
+
+        # join reference entries with the entries of their hypothesis on ngram id
+        hyp_keys = hyp_sents * vocab_size + hyp_ngrams
+        order = np.argsort(hyp_keys, kind="stable")
+        hyp_keys = hyp_keys[order]
+        ref_keys = ref_tests[ref_sents] * vocab_size + ref_ngrams
+        positions = np.minimum(np.searchsorted(hyp_keys, ref_keys), len(hyp_keys) - 1)
+        matched = (
+            hyp_keys[positions] == ref_keys
+            if len(hyp_keys)
+            else np.zeros(len(ref_keys), dtype=bool)
+        )
+        matched_hyp_values = hyp_values[order][positions[matched]]
+        matched_ref_values = ref_values[matched]
+
+        # vrama91 : added clipping
+        # bincount returns integers if no ngram matches (empty weights), so cast to float
+        val = (
+            np.bincount(
+                ref_sents[matched] * self.n + ref_orders[matched],
+                weights=np.minimum(matched_hyp_values, matched_ref_values)
+                * matched_ref_values,
+                minlength=num_refs * self.n,
+            )
+            .astype(np.float64)
+            .reshape(num_refs, self.n)
+        )
+
+        norm_products = hyp_norms[ref_tests] * ref_norms
+        nonzero = (hyp_norms[ref_tests] != 0) & (ref_norms != 0)
+        val[nonzero] /= norm_products[nonzero]
+        assert not np.isnan(val).any()
+
+        # vrama91: added a length based gaussian penalty
+        delta = hyp_lengths[ref_tests] - ref_lengths
+        val *= np.power(np.e, -(delta**2) / (2 * self.sigma**2))[:, None]
+
+        score = np.zeros((num_tests, self.n))
+        np.add.at(score, ref_tests, val)
+        # change by vrama91 - mean of ngram scores, instead of sum
+        # divide by number of references and multiply score by 10
+        return np.mean(score, axis=1) / ref_counts * 10.0
+
     def compute_score(self, option=None, verbose=0):
+        if self.vectorized:
+            # compute idf and cider score in one pass
+            scores = self.compute_cider_vectorized()
+            return np.mean(scores), scores
         # compute idf
         self.compute_doc_freq()
         # assert to check document frequency
@@ -199,3 +299,42 @@ class CiderScorer(object):
         # debug
         # print score
         return np.mean(np.array(score)), np.array(score)
+
+
+def _sparse_entries(counts_list, ngram_ids):
+    """
+    Flatten ngram counts of sentences into parallel (sentence, ngram id, ngram order, tf) arrays.
+    Count dicts shared between sentences (e.g. by an NgramFeaturizer) are only converted once.
+    :param counts_list: list of dict : ngram counts of each sentence
+    :param ngram_ids: dict : mapping of ngrams to integer ids, extended in place
+    """
+    converted = {}
+    lengths, ngrams, orders, tfs = [], [], [], []
+    for counts in counts_list:
+        entries = converted.get(id(counts))
+        if entries is None:
+            entries = ([], [], [])
+            for ngram, term_freq in counts.items():
+                ngram_id = ngram_ids.get(ngram)
+                if ngram_id is None:
+                    ngram_id = ngram_ids[ngram] = len(ngram_ids)
+                entries[0].append(ngram_id)
+                entries[1].append(len(ngram) - 1)
+                entries[2].append(term_freq)
+            converted[id(counts)] = entries
+        lengths.append(len(entries[0]))
+        ngrams.extend(entries[0])
+        orders.extend(entries[1])
+        tfs.extend(entries[2])
+    return (
+        np.repeat(np.arange(len(counts_list), dtype=np.int64), lengths),
+        np.array(ngrams, dtype=np.int64),
+        np.array(orders, dtype=np.int64),
+        np.array(tfs, dtype=np.float64),
+    )
+
+
+def _norms(sents, orders, values, num_sents, n):
+    return np.sqrt(
+        np.bincount(sents * n + orders, weights=values**2, minlength=num_sents * n)
+    ).reshape(num_sents, n)
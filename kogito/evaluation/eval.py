@@ -1,33 +1,90 @@
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import math
+import time
 
-from kogito.evaluation.bleu.bleu import Bleu
-from kogito.evaluation.meteor.meteor import Meteor
-from kogito.evaluation.rouge.rouge import Rouge
-from kogito.evaluation.cider.cider import Cider
-from kogito.evaluation.bert_score.bert_score import BertScore
+import numpy as np
+
+from kogito.evaluation.breakdown import ScoreBreakdown
+from kogito.evaluation.ngrams import NgramFeaturizer
+from kogito.evaluation.registry import MetricRegistry
 from kogito.core.knowledge import Knowledge
 
+# Metrics are created on first use, so that their dependencies (NLTK, BERT)
+# are only imported when they are actually computed
+METRIC_MAP = MetricRegistry()
+METRIC_MAP.register(
+    "bleu", "kogito.evaluation.bleu.bleu:Bleu", ["Bleu_1", "Bleu_2", "Bleu_3", "Bleu_4"]
+)
+METRIC_MAP.register("meteor", "kogito.evaluation.meteor.meteor:Meteor", "METEOR")
+METRIC_MAP.register("rouge", "kogito.evaluation.rouge.rouge:Rouge", "ROUGE_L")
+METRIC_MAP.register("cider", "kogito.evaluation.cider.cider:Cider", "CIDEr")
+METRIC_MAP.register(
+    "bert-score", "kogito.evaluation.bert_score.bert_score:BertScore", "Bert Score"
+)
+
+register_metric = METRIC_MAP.register
 
-METRIC_MAP = {
-    "bleu": (Bleu(4), ["Bleu_1", "Bleu_2", "Bleu_3", "Bleu_4"]),
-    "meteor": (Meteor(), "METEOR"),
-    "rouge": (Rouge(), "ROUGE_L"),
-    "cider": (Cider(), "CIDEr"),
-    "bert-score": (BertScore(), "Bert Score"),
-}
+# Metrics whose corpus statistics are cooked per shard and merged before scoring,
+# they share n-gram counts through an NgramFeaturizer
+COOKED_METRICS = {"bleu", "cider"}
+# Metrics that can be split across workers by key
+SHARDABLE_METRICS = COOKED_METRICS | {"meteor", "rouge"}
 
 
 class Evaluator:
-    def __init__(self, gts, res, metrics):
+    def __init__(self, gts, res, metrics, workers=1, shard=False):
+        """Initialize an evaluator
+
+        Args:
+            gts (dict): Reference sentences by key.
+            res (dict): Candidate sentences by key.
+            metrics (List[str]): Metrics to compute.
+            workers (int, optional): Number of worker processes. If greater than 1,
+                metrics are computed concurrently on a process pool. Defaults to 1.
+            shard (bool, optional): Whether to split shardable metrics across workers by key.
+                Partial statistics are merged so that scores are the same as without sharding.
+                Defaults to False.
+        """
         self.gts = gts
         self.res = res
-        self.scorers = [METRIC_MAP[metric] for metric in metrics]
+        self.metrics = list(metrics)
+        self.methods = [METRIC_MAP.method(metric) for metric in self.metrics]
+        self.workers = workers
+        self.shard = shard
+        self.timings: Dict[str, float] = {}
+        # (score, per-item scores) and cooked corpus statistics of each computed metric
+        self.results: Dict[str, Tuple] = {}
+        self.cooked: Dict[str, object] = {}
+
+    @property
+    def scorers(self):
+        return [METRIC_MAP[metric] for metric in self.metrics]
 
     def evaluate(self):
+        if self.workers > 1:
+            results = self._evaluate_parallel()
+        else:
+            results = {}
+            featurizer = NgramFeaturizer()
+            for metric in self.metrics:
+                start = time.perf_counter()
+                scorer, _ = METRIC_MAP[metric]
+                if metric in COOKED_METRICS:
+                    self.cooked[metric] = scorer.cook(
+                        self.gts, self.res, featurizer=featurizer
+                    )
+                    results[metric] = scorer.score_cooked(self.cooked[metric])
+                else:
+                    results[metric] = scorer.compute_score(self.gts, self.res)
+                self.timings[metric] = time.perf_counter() - start
+
+        self.results = results
+
         score_dict = {}
 
-        for scorer, method in self.scorers:
-            score, _ = scorer.compute_score(self.gts, self.res)
+        for metric, method in zip(self.metrics, self.methods):
+            score, _ = results[metric]
             if type(method) == list:
                 for sc, m in zip(score, method):
                     score_dict[m] = str(sc)
@@ -36,18 +93,115 @@ class Evaluator:
 
         return score_dict
 
+    def _evaluate_parallel(self):
+        keys = list(self.gts.keys())
+        results = {}
+        parts = {}
+        pending = {}
+        start = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {}
+
+            for metric in self.metrics:
+                if self.shard and metric in SHARDABLE_METRICS and len(keys) > 1:
+                    shard_size = math.ceil(len(keys) / self.workers)
+                    shards = [
+                        keys[i : i + shard_size]
+                        for i in range(0, len(keys), shard_size)
+                    ]
+                else:
+                    shards = [keys]
+
+                parts[metric] = [None] * len(shards)
+                pending[metric] = len(shards)
+
+                for index, shard_keys in enumerate(shards):
+                    future = executor.submit(
+                        _score_shard,
+                        metric,
+                        {key: self.gts[key] for key in shard_keys},
+                        {key: self.res[key] for key in shard_keys},
+                    )
+                    futures[future] = (metric, index)
+
+            for future in as_completed(futures):
+                metric, index = futures[future]
+                parts[metric][index] = future.result()
+                pending[metric] -= 1
+
+                if pending[metric] == 0:
+                    if metric in COOKED_METRICS:
+                        # merge corpus statistics (BLEU counts, CIDEr n-grams for document frequencies)
+                        self.cooked[metric] = _merge_cooked(parts.pop(metric))
+                        results[metric] = METRIC_MAP[metric][0].score_cooked(
+                            self.cooked[metric]
+                        )
+                    else:
+                        results[metric] = _merge_shards(parts.pop(metric))
+                    self.timings[metric] = time.perf_counter() - start
+
+        return results
 
-def topk_eval(data: List[Tuple[Knowledge, List[str]]], metrics, k=1):
+
+def _score_shard(metric, gts, res):
+    scorer = METRIC_MAP[metric][0]
+
+    if metric in COOKED_METRICS:
+        return scorer.cook(gts, res)
+
+    return scorer.compute_score(gts, res)
+
+
+def _merge_cooked(parts):
+    cooked = parts[0]
+    for part in parts[1:]:
+        cooked += part
+    return cooked
+
+
+def _merge_shards(parts):
+    if len(parts) == 1:
+        return parts[0]
+
+    if isinstance(parts[0][1], np.ndarray):
+        scores = np.concatenate([shard_scores for _, shard_scores in parts])
+        return np.mean(scores), scores
+
+    scores = [score for _, shard_scores in parts for score in shard_scores]
+    return sum(scores) / len(scores), scores
+
+
+def topk_eval(
+    data: List[Tuple[Knowledge, List[str]]],
+    metrics,
+    k=1,
+    workers=1,
+    shard=False,
+    report_time=False,
+    return_breakdown=False,
+):
     topk_gts = {}
     topk_res = {}
+    groups = {"relation": [], "head_type": [], "k": []}
 
     for i, (kg, reference) in enumerate(data):
         for j, g in enumerate(kg.tails[:k]):
             key = str(i) + "_" + str(j)
             topk_gts[key] = reference
             topk_res[key] = [g]
+            groups["relation"].append(str(kg.relation))
+            groups["head_type"].append(kg.head.type.value)
+            groups["k"].append(j + 1)
 
-    evaluator = Evaluator(topk_gts, topk_res, metrics)
+    evaluator = Evaluator(topk_gts, topk_res, metrics, workers=workers, shard=shard)
     scores = evaluator.evaluate()
 
+    if report_time:
+        for metric, elapsed in evaluator.timings.items():
+            print(f"{metric}: {elapsed:.2f}s")
+
+    if return_breakdown:
+        return scores, ScoreBreakdown.from_evaluator(evaluator, groups=groups)
+
     return scores
@@ -0,0 +1,316 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+import math
+
+import numpy as np
+
+from kogito.core.knowledge import Knowledge
+from kogito.evaluation.eval import METRIC_MAP, COOKED_METRICS
+from kogito.evaluation.ngrams import NgramFeaturizer
+
+
+class MetricState(ABC):
+    """
+    Mergeable sufficient statistics of a metric.
+    """
+
+    def __init__(self, metric: str) -> None:
+        self.metric = metric
+        self.count = 0
+
+    @abstractmethod
+    def update(self, gts: dict, res: dict, featurizer: NgramFeaturizer = None) -> None:
+        """Add statistics of a batch of sentences
+
+        Args:
+            gts (dict): Reference sentences by key.
+            res (dict): Candidate sentences by key.
+            featurizer (NgramFeaturizer, optional): N-gram featurizer shared with other metrics
+                for this batch. Defaults to None.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def merge(self, other: "MetricState") -> "MetricState":
+        """Merge statistics of another state of the same metric into this one
+
+        Args:
+            other (MetricState): State computed on a disjoint set of sentences
+
+        Returns:
+            MetricState: This state
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def result(self):
+        """Compute the metric score from the collected statistics
+
+        Returns:
+            Corpus level score(s) in the same form as the metric's ``compute_score``
+        """
+        raise NotImplementedError
+
+
+class MeanState(MetricState):
+    """
+    State of metrics averaged over sentences whose sentence scores do not depend on other sentences
+    (METEOR, ROUGE-L).
+    """
+
+    def __init__(self, metric: str) -> None:
+        super().__init__(metric)
+        self.total = 0.0
+
+    def update(self, gts: dict, res: dict, featurizer: NgramFeaturizer = None) -> None:
+        _, scores = METRIC_MAP[self.metric][0].compute_score(gts, res)
+        self.total += float(sum(scores))
+        self.count += len(scores)
+
+    def merge(self, other: "MeanState") -> "MeanState":
+        self.total += other.total
+        self.count += other.count
+        return self
+
+    def result(self) -> float:
+        return self.total / self.count
+
+
+class BleuState(MetricState):
+    """
+    State of corpus BLEU: total hypothesis and closest reference lengths
+    and clipped n-gram match and guess counts.
+    """
+
+    def __init__(self, metric: str = "bleu") -> None:
+        super().__init__(metric)
+        self.n = METRIC_MAP[metric][0]._n
+        self.testlen = 0
+        self.reflen = 0
+        self.guess = [0] * self.n
+        self.correct = [0] * self.n
+
+    def update(self, gts: dict, res: dict, featurizer: NgramFeaturizer = None) -> None:
+        bleu_scorer = METRIC_MAP[self.metric][0].cook(gts, res, featurizer=featurizer)
+
+        for comps in bleu_scorer.ctest:
+            self.testlen += comps["testlen"]
+            self.reflen += bleu_scorer._single_reflen(
+                comps["reflen"], "closest", comps["testlen"]
+            )
+            for k in range(self.n):
+                self.guess[k] += comps["guess"][k]
+                self.correct[k] += comps["correct"][k]
+
+        self.count += len(bleu_scorer.ctest)
+
+    def merge(self, other: "BleuState") -> "BleuState":
+        self.testlen += other.testlen
+        self.reflen += other.reflen
+        self.guess = [a + b for a, b in zip(self.guess, other.guess)]
+        self.correct = [a + b for a, b in zip(self.correct, other.correct)]
+        self.count += other.count
+        return self
+
+    def result(self) -> List[float]:
+        # same computation as BleuScorer.compute_score on the whole corpus
+        small = 1e-9
+        tiny = 1e-15
+        bleus = []
+        bleu = 1.0
+        for k in range(self.n):
+            bleu *= float(self.correct[k] + tiny) / (self.guess[k] + small)
+            bleus.append(bleu ** (1.0 / (k + 1)))
+        ratio = (self.testlen + tiny) / (self.reflen + small)
+        if ratio < 1:
+            for k in range(self.n):
+                bleus[k] *= math.exp(1 - 1 / ratio)
+        return bleus
+
+
+class CiderState(MetricState):
+    """
+    State of CIDEr. Document frequencies are computed over the whole corpus,
+    so n-gram counts of all sentences are kept (not the sentences themselves).
+    """
+
+    def __init__(self, metric: str = "cider") -> None:
+        super().__init__(metric)
+        self.cider_scorer = None
+
+    def update(self, gts: dict, res: dict, featurizer: NgramFeaturizer = None) -> None:
+        cider_scorer = METRIC_MAP[self.metric][0].cook(gts, res, featurizer=featurizer)
+
+        if self.cider_scorer is None:
+            self.cider_scorer = cider_scorer
+        else:
+            self.cider_scorer += cider_scorer
+
+        self.count += len(gts)
+
+    def merge(self, other: "CiderState") -> "CiderState":
+        if other.cider_scorer is not None:
+            if self.cider_scorer is None:
+                self.cider_scorer = other.cider_scorer.copy()
+            else:
+                self.cider_scorer += other.cider_scorer
+        self.count += other.count
+        return self
+
+    def result(self) -> float:
+        score, _ = METRIC_MAP[self.metric][0].score_cooked(self.cider_scorer)
+        return score
+
+
+class BertScoreState(MetricState):
+    """
+    State of BERTScore. Idf weights depend on all references, so document frequencies are accumulated
+    and the greedy matching similarities of each candidate and reference word piece are kept
+    (not the embeddings), to weight and score all pairs with the idf of the whole corpus.
+    """
+
+    def __init__(self, metric: str = "bert-score") -> None:
+        super().__init__(metric)
+        self.document_frequency = None
+        self.num_docs = 0
+        # greedy matches of the hypothesis with each reference, per item
+        self.matches = []
+
+    def update(self, gts: dict, res: dict, featurizer: NgramFeaturizer = None) -> None:
+        bert_score = METRIC_MAP[self.metric][0]
+        hyp_input, ref_input, same_indices = bert_score.pairs(gts, res)
+        matches = bert_score.scorer.greedy_match(hyp_input, ref_input)
+        document_frequency = bert_score.scorer.document_frequency(ref_input)
+
+        if self.document_frequency is None:
+            self.document_frequency = document_frequency
+        else:
+            self.document_frequency = self.document_frequency + document_frequency
+
+        self.num_docs += len(ref_input)
+        start = 0
+        for end in same_indices:
+            self.matches.append(matches[start:end])
+            start = end
+
+        self.count += len(same_indices)
+
+    def merge(self, other: "BertScoreState") -> "BertScoreState":
+        if other.document_frequency is not None:
+            if self.document_frequency is None:
+                self.document_frequency = other.document_frequency.copy()
+            else:
+                self.document_frequency = (
+                    self.document_frequency + other.document_frequency
+                )
+        self.num_docs += other.num_docs
+        self.matches.extend(other.matches)
+        self.count += other.count
+        return self
+
+    def result(self) -> float:
+        scorer = METRIC_MAP[self.metric][0].scorer
+        idf = scorer.idf_from_frequency(self.document_frequency, self.num_docs)
+        _, _, f_scores = scorer.score_matches(
+            [match for matches in self.matches for match in matches], idf
+        )
+        bounds = np.cumsum([len(matches) for matches in self.matches])[:-1]
+        scores = [
+            float(item_scores.mean()) for item_scores in np.split(f_scores, bounds)
+        ]
+        return sum(scores) / len(scores)
+
+
+STATE_MAP = {"bleu": BleuState, "cider": CiderState, "bert-score": BertScoreState}
+
+
+class IncrementalEvaluator:
+    """
+    Evaluator that scores generations batch by batch with mergeable statistics.
+    Evaluators updated on disjoint shards (e.g. in separate processes) can be merged
+    to get the scores of the whole dataset.
+    """
+
+    def __init__(self, metrics: List[str], k: int = 1) -> None:
+        """Initialize an incremental evaluator
+
+        Args:
+            metrics (List[str]): Metrics to compute.
+            k (int, optional): Top k generations to evaluate. Defaults to 1.
+        """
+        invalid_metrics = set(metrics) - set(METRIC_MAP.keys())
+
+        if invalid_metrics:
+            raise ValueError(f"Invalid evaluation metrics found: {invalid_metrics}")
+
+        self.metrics = list(metrics)
+        self.k = k
+        self.states: Dict[str, MetricState] = {
+            metric: STATE_MAP.get(metric, MeanState)(metric) for metric in self.metrics
+        }
+
+    def update(self, batch: List[Tuple[Knowledge, List[str]]]) -> None:
+        """Add a batch of generations to the evaluation
+
+        Args:
+            batch (List[Tuple[Knowledge, List[str]]]): Pairs of generated knowledge and reference tails
+        """
+        gts = {}
+        res = {}
+
+        for i, (kg, reference) in enumerate(batch):
+            for j, g in enumerate(kg.tails[: self.k]):
+                key = str(i) + "_" + str(j)
+                gts[key] = reference
+                res[key] = [g]
+
+        if not gts:
+            return
+
+        # n-gram counts are shared by metrics within a batch only to keep memory flat
+        featurizer = NgramFeaturizer()
+
+        for metric, state in self.states.items():
+            state.update(
+                gts, res, featurizer=featurizer if metric in COOKED_METRICS else None
+            )
+
+    def merge(self, other: "IncrementalEvaluator") -> "IncrementalEvaluator":
+        """Merge another evaluator updated on a disjoint set of generations
+
+        Args:
+            other (IncrementalEvaluator): Evaluator with the same metrics and k
+
+        Returns:
+            IncrementalEvaluator: This evaluator
+        """
+        if other.metrics != self.metrics or other.k != self.k:
+            raise ValueError("Cannot merge evaluators with different metrics or k")
+
+        for metric, state in self.states.items():
+            state.merge(other.states[metric])
+
+        return self
+
+    def result(self) -> dict:
+        """Compute scores from the collected statistics
+
+        Returns:
+            dict: Dictionary of scores in the same format as ``topk_eval``
+        """
+        score_dict = {}
+
+        for metric, state in self.states.items():
+            if state.count == 0:
+                raise ValueError("No generations to evaluate")
+
+            score = state.result()
+            method = METRIC_MAP.method(metric)
+
+            if isinstance(method, list):
+                for sc, m in zip(score, method):
+                    score_dict[m] = str(sc)
+            else:
+                score_dict[method] = score
+
+        return score_dict
@@ -3,29 +3,89 @@
 # Python wrapper for METEOR implementation, by Xinlei Chen
 # Acknowledge Michael Denkowski for the generous discussion and help
 
+from functools import lru_cache
 
+from nltk.corpus import wordnet
+from nltk.stem.api import StemmerI
+from nltk.stem.porter import PorterStemmer
 from nltk.translate.meteor_score import meteor_score
 from nltk.tokenize import word_tokenize
 
+LOOKUP_CACHE_SIZE = 65536
 
-class Meteor:
-    def __init__(self):
-        pass
 
+class CachedStemmer(StemmerI):
+    """Stemmer memoizing stems of seen words"""
+
+    def __init__(self, stemmer=None):
+        self._stemmer = stemmer or PorterStemmer()
+        self._stem = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._stemmer.stem)
+
+    def stem(self, token):
+        return self._stem(token)
+
+
+class CachedWordNet:
+    """WordNet reader memoizing synset lookups of seen words"""
+
+    def __init__(self, reader=wordnet):
+        # the reader is only accessed on the first lookup, so the corpus is loaded lazily
+        self._reader = reader
+        self._synsets = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._lookup)
+
+    def _lookup(self, lemma):
+        return self._reader.synsets(lemma)
+
+    def synsets(self, lemma):
+        return self._synsets(lemma)
+
+
+# Lookups are cached across calls, per process
+_stemmer = CachedStemmer()
+_wordnet = CachedWordNet()
+
+
+def _meteor_scores(items):
+    return [
+        round(
+            meteor_score(
+                [list(ref) for ref in refs],
+                list(hypo),
+                stemmer=_stemmer,
+                wordnet=_wordnet,
+            ),
+            4,
+        )
+        for refs, hypo in items
+    ]
+
+
+class Meteor:
+    # Scoring runs in the calling process. METEOR is parallelized by splitting keys across
+    # worker processes with Evaluator(workers=..., shard=True), as per-item scores do not depend on other items.
     def compute_score(self, gts, res):
         assert gts.keys() == res.keys()
         imgIds = gts.keys()
-        scores = []
+
+        tokens = {}
+        items = {}
+        keys = []
 
         for i in imgIds:
             assert len(res[i]) == 1
-            score = round(
-                meteor_score(
-                    [word_tokenize(s) for s in gts[i]], word_tokenize(res[i][0])
-                ),
-                4,
-            )
-            scores.append(score)
+            # tokenize each unique sentence once
+            for s in gts[i] + res[i]:
+                if s not in tokens:
+                    tokens[s] = tuple(word_tokenize(s))
+            key = (tuple(tokens[s] for s in gts[i]), tokens[res[i][0]])
+            items.setdefault(key, None)
+            keys.append(key)
+
+        unique_items = list(items)
+        unique_scores = _meteor_scores(unique_items)
+
+        items = dict(zip(unique_items, unique_scores))
+        scores = [items[key] for key in keys]
 
         return sum(scores) / len(scores), scores
 
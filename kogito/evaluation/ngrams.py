@@ -0,0 +1,43 @@
+class NgramFeaturizer:
+    """
+    Shared n-gram featurization for BLEU and CIDEr.
+    Each unique sentence is tokenized and its n-grams are counted only once,
+    n-gram tuples are interned so that equal n-grams share a single object.
+    """
+
+    def __init__(self, n=4):
+        """
+        :param n: int : maximum n-gram order to count
+        """
+        self.n = n
+        self._cache = {}
+        self._ngrams = {}
+
+    def __len__(self):
+        return len(self._cache)
+
+    def precook(self, s):
+        """
+        Tokenizes a sentence on whitespace and counts its n-grams up to order n.
+        Returned counts are shared between calls and must not be modified.
+        :param s: string : sentence to be converted into ngrams
+        :return: (length, counts) : number of words and term frequency of each occurring ngram
+        """
+        cooked = self._cache.get(s)
+
+        if cooked is None:
+            words = s.split()
+            counts = {}
+            for k in range(1, self.n + 1):
+                for i in range(len(words) - k + 1):
+                    ngram = tuple(words[i : i + k])
+                    ngram = self._ngrams.setdefault(ngram, ngram)
+                    counts[ngram] = counts.get(ngram, 0) + 1
+            cooked = self._cache[s] = (len(words), counts)
+
+        return cooked
+
+    def clear(self):
+        """Drops all cached sentences and n-grams"""
+        self._cache.clear()
+        self._ngrams.clear()
@@ -0,0 +1,70 @@
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+from collections.abc import Mapping
+from importlib import import_module
+import threading
+
+MetricFactory = Union[str, Callable[[], Any]]
+MetricMethod = Union[str, List[str]]
+
+
+class MetricRegistry(Mapping):
+    """
+    Registry of evaluation metrics by name.
+    Metrics are registered with a factory and only created (and their modules imported) on first use.
+    Looking up a metric returns a ``(scorer, method)`` pair, where ``method`` is the name of the score
+    or a list of names if the scorer returns multiple scores.
+    """
+
+    def __init__(self) -> None:
+        self._factories: Dict[str, Tuple[MetricFactory, MetricMethod]] = {}
+        self._metrics: Dict[str, Tuple[Any, MetricMethod]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: MetricFactory, method: MetricMethod) -> None:
+        """Register a metric
+
+        Args:
+            name (str): Metric name, e.g. "bleu".
+            factory (MetricFactory): Callable creating the scorer or its import path
+                in the form "package.module:ClassName". The scorer should implement
+                ``compute_score(gts, res)`` returning a ``(score, scores)`` pair.
+            method (MetricMethod): Name of the score(s) returned by the scorer.
+        """
+        with self._lock:
+            self._factories[name] = (factory, method)
+            self._metrics.pop(name, None)
+
+    def method(self, name: str) -> MetricMethod:
+        """Name of the score(s) of a metric without creating it
+
+        Args:
+            name (str): Metric name
+
+        Returns:
+            MetricMethod: Score name or list of score names
+        """
+        return self._factories[name][1]
+
+    def __getitem__(self, name: str) -> Tuple[Any, MetricMethod]:
+        metric = self._metrics.get(name)
+
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+
+                if metric is None:
+                    factory, method = self._factories[name]
+
+                    if isinstance(factory, str):
+                        module_name, class_name = factory.split(":")
+                        factory = getattr(import_module(module_name), class_name)
+
+                    metric = self._metrics[name] = (factory(), method)
+
+        return metric
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
@@ -34,6 +34,36 @@ def my_lcs(string, sub):
     return lengths[len(string)][len(sub)]
 
 
+def match_masks(tokens):
+    """
+    Builds bit masks of token positions used by the bit-parallel LCS
+    :param tokens : list of hashable : tokens of a sentence
+    :returns: masks (dict): bit mask of the positions of each distinct token
+    """
+    masks = {}
+    for i, token in enumerate(tokens):
+        masks[token] = masks.get(token, 0) | (1 << i)
+    return masks
+
+
+def bit_lcs(masks, length, sub):
+    """
+    Calculates longest common subsequence length with the bit-parallel algorithm
+    of Allison-Dix and Hyyro, processing one token of sub per step over all positions
+    of the other string at once
+    :param masks : dict : match masks of the other string, see match_masks
+    :param length : int : number of tokens in the other string
+    :param sub : list of hashable : tokens of the second string
+    :returns: length (int): length of the longest common subsequence between the two strings
+    """
+    full = (1 << length) - 1
+    v = full
+    for token in sub:
+        u = v & masks.get(token, 0)
+        v = ((v + u) | (v - u)) & full
+    return length - bin(v).count("1")
+
+
 class Rouge:
     """
     Class for computing ROUGE-L score for a set of candidate sentences for the MS COCO test set
@@ -43,6 +73,8 @@ class Rouge:
     def __init__(self):
         # vrama91: updated the value below based on discussion with Hovey
         self.beta = 1.2
+        # reference tokens and match masks, shared by all candidates scored against a reference
+        self._ref_cache = {}
 
     def calc_score(self, candidate, refs):
         """
@@ -60,12 +92,15 @@ class Rouge:
         token_c = candidate[0].split(" ")
 
         for reference in refs:
-            # split into tokens
-            token_r = reference.split(" ")
+            # split into tokens and build match masks once per reference
+            if reference not in self._ref_cache:
+                token_r = reference.split(" ")
+                self._ref_cache[reference] = (len(token_r), match_masks(token_r))
+            len_r, masks_r = self._ref_cache[reference]
             # compute the longest common subsequence
-            lcs = my_lcs(token_r, token_c)
+            lcs = bit_lcs(masks_r, len_r, token_c)
             prec.append(lcs / float(len(token_c)))
-            rec.append(lcs / float(len(token_r)))
+            rec.append(lcs / float(len_r))
 
         prec_max = max(prec)
         rec_max = max(rec)
@@ -92,11 +127,16 @@ class Rouge:
         imgIds = gts.keys()
 
         score = []
+        scores_cache = {}
         for id in imgIds:
             hypo = res[id]
             ref = gts[id]
 
-            score.append(self.calc_score(hypo, ref))
+            # the same (candidate, references) pair is only scored once
+            key = (tuple(hypo), tuple(ref))
+            if key not in scores_cache:
+                scores_cache[key] = self.calc_score(hypo, ref)
+            score.append(scores_cache[key])
 
             # Sanity check.
             assert type(hypo) is list
@@ -104,6 +144,8 @@ class Rouge:
             assert type(ref) is list
             assert len(ref) > 0
 
+        self._ref_cache.clear()
+
         average_score = np.mean(np.array(score))
         return average_score, np.array(score)
 
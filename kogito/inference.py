@@ -1,8 +1,10 @@
-from typing import Union, List, Optional
+from typing import Union, List, Optional, Iterable, Iterator, Dict, Tuple
 from itertools import product
+import time
 import warnings
 
 import spacy
+from spacy.tokens import Doc
 
 from kogito.core.knowledge import Knowledge, KnowledgeGraph
 from kogito.core.head import KnowledgeHead
@@ -108,10 +110,218 @@ class CommonsenseInference:
         Returns:
             KnowledgeGraph: Inferred knowledge graph.
         """
+        model_args = model_args or {}
+        doc = None
+
+        if extract_heads and text:
+            print("Extracting heads...")
+            # Parse once and share the doc across all head extractors
+            doc = self.nlp(text)
+
+        kg_heads = self._collect_heads(
+            text, doc=doc, heads=heads, extract_heads=extract_heads
+        )
+
+        if match_relations:
+            print("Matching relations...")
+
+        input_graph = KnowledgeGraph(
+            self._build_knowledge(
+                kg_heads,
+                match_relations=match_relations,
+                relations=relations,
+                sample_graph=sample_graph,
+            )
+        )
+
+        if sample_graph:
+            input_graph = input_graph + sample_graph
+        else:
+            if isinstance(model, GPT3Zeroshot):
+                warnings.warn(
+                    "Sample graph is recommended for good performance with GPT-3 based inference"
+                )
+
+        if dry_run or not model:
+            return input_graph
+
+        print("Generating commonsense graph...")
+        output_graph = model.generate(input_graph, **model_args)
+
+        return output_graph
+
+    def infer_batch(
+        self,
+        texts: List[str],
+        model: Optional[KnowledgeModel] = None,
+        heads: Optional[List[str]] = None,
+        model_args: Optional[dict] = None,
+        extract_heads: bool = True,
+        match_relations: bool = True,
+        relations: Optional[List[KnowledgeRelation]] = None,
+        dry_run: bool = False,
+        sample_graph: Optional[KnowledgeGraph] = None,
+        batch_size: int = 64,
+        n_process: int = 1,
+        report_throughput: bool = False,
+    ) -> List[KnowledgeGraph]:
+        """Make commonsense inferences for multiple texts at once.
+        Texts are parsed in batches with ``nlp.pipe``, head-relation pairs from all texts are pooled
+        into a single input graph and generated in one ``KnowledgeModel.generate()`` call.
+        Generated tails are then mapped back to the texts they came from.
+
+        Args:
+            texts (List[str]): Texts to use to extract commonsense inferences from.
+            model (Optional[KnowledgeModel], optional): Knowledge model to use for inference.
+                If omitted, behaviour is equivalent to dry-run mode. Defaults to None.
+            heads (Optional[List[str]], optional): List of custom heads to use for every text. Defaults to None.
+            model_args (Optional[dict], optional): Custom arguments to pass to ``KnowledgeModel.generate()`` method.
+                Defaults to None.
+            extract_heads (bool, optional): Whether to extract heads from given texts. Defaults to True.
+            match_relations (bool, optional): Whether to do smart relation matching. Defaults to True.
+            relations (Optional[List[KnowledgeRelation]], optional): Subset of relations to use for direct matching.
+                Defaults to None.
+            dry_run (bool, optional): Whether to skip actual inference and return incomplete input graphs.
+                Defaults to False.
+            sample_graph (Optional[KnowledgeGraph], optional): A knowledge graph containing examples.
+                Defaults to None.
+            batch_size (int, optional): Number of texts to buffer in ``nlp.pipe``. Defaults to 64.
+            n_process (int, optional): Number of processes to use for parsing. Defaults to 1.
+            report_throughput (bool, optional): Whether to print per-stage throughput. Defaults to False.
+
+        Raises:
+            ValueError: if no relation found to match or relations argument is not of type list
+
+        Returns:
+            List[KnowledgeGraph]: One inferred knowledge graph per input text.
+        """
+        texts = list(texts)
+        model_args = model_args or {}
+        throughput = []
+
+        start = time.perf_counter()
+        if extract_heads:
+            docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        else:
+            docs = (None for _ in texts)
+
+        text_heads = [
+            self._collect_heads(text, doc=doc, heads=heads, extract_heads=extract_heads)
+            for text, doc in zip(texts, docs)
+        ]
+        throughput.append(("Head extraction", len(texts), time.perf_counter() - start))
+
+        start = time.perf_counter()
+        text_knowledge = [
+            self._build_knowledge(
+                kg_heads,
+                match_relations=match_relations,
+                relations=relations,
+                sample_graph=sample_graph,
+            )
+            for kg_heads in text_heads
+        ]
+        throughput.append(
+            (
+                "Relation matching",
+                sum(len(kg_heads) for kg_heads in text_heads),
+                time.perf_counter() - start,
+            )
+        )
+
+        # Pool unique head-relation pairs from all texts into a single generation job
+        pooled_knowledge: Dict[Tuple[KnowledgeHead, KnowledgeRelation], Knowledge] = {}
+        for kg_list in text_knowledge:
+            for kg in kg_list:
+                pooled_knowledge.setdefault((kg.head, kg.relation), kg)
+
+        input_kgs = list(pooled_knowledge.values())
+
+        if sample_graph:
+            # Samples are appended after the pooled knowledge (instead of a set union) to keep the order
+            pooled_kgs = set(input_kgs)
+            input_kgs.extend(
+                kg for kg in dict.fromkeys(sample_graph) if kg not in pooled_kgs
+            )
+        else:
+            if isinstance(model, GPT3Zeroshot):
+                warnings.warn(
+                    "Sample graph is recommended for good performance with GPT-3 based inference"
+                )
+
+        input_graph = KnowledgeGraph(input_kgs)
+
+        if dry_run or not model:
+            if report_throughput:
+                _print_throughput(throughput)
+            return [
+                (
+                    KnowledgeGraph(kg_list) + sample_graph
+                    if sample_graph
+                    else KnowledgeGraph(kg_list)
+                )
+                for kg_list in text_knowledge
+            ]
+
+        start = time.perf_counter()
+        output_graph = model.generate(input_graph, **model_args)
+        throughput.append(("Generation", len(input_graph), time.perf_counter() - start))
+
+        # Sample knowledge follows the pooled knowledge in the input graph and models keep the input order
+        # (or, like GPT-3, do not output samples at all), so the first output of a head-relation pair is
+        # the generated one. Outputs of samples with the same head and relation must not overwrite it.
+        generated_tails = {}
+        for kg in output_graph:
+            generated_tails.setdefault((kg.head, kg.relation), kg.tails)
+        output_graphs = []
+
+        for kg_list in text_knowledge:
+            output_kgs = []
+            for kg in kg_list:
+                output_kg = kg.copy()
+                output_kg.tails = list(generated_tails.get((kg.head, kg.relation), []))
+                output_kgs.append(output_kg)
+            output_graphs.append(KnowledgeGraph(output_kgs))
+
+        if report_throughput:
+            _print_throughput(throughput)
+
+        return output_graphs
+
+    def infer_stream(
+        self, texts: Iterable[str], chunk_size: int = 1000, **kwargs
+    ) -> Iterator[KnowledgeGraph]:
+        """Make commonsense inferences for a stream of texts.
+        Texts are consumed in chunks which are processed with ``infer_batch``.
+
+        Args:
+            texts (Iterable[str]): Stream of texts to use to extract commonsense inferences from.
+            chunk_size (int, optional): Number of texts to process in one batch. Defaults to 1000.
+            **kwargs (optional): Extra keyword arguments for ``infer_batch`` method.
+
+        Yields:
+            KnowledgeGraph: Inferred knowledge graph for each input text in order.
+        """
+        chunk = []
+
+        for text in texts:
+            chunk.append(text)
+            if len(chunk) >= chunk_size:
+                yield from self.infer_batch(chunk, **kwargs)
+                chunk = []
+
+        if chunk:
+            yield from self.infer_batch(chunk, **kwargs)
+
+    def _collect_heads(
+        self,
+        text: Optional[str],
+        doc: Optional[Doc] = None,
+        heads: Optional[List[str]] = None,
+        extract_heads: bool = True,
+    ) -> List[KnowledgeHead]:
         kg_heads = []
-        head_relations = set()
         head_texts = set()
-        model_args = model_args or {}
 
         if heads:
             for head in heads:
@@ -120,9 +330,10 @@ class CommonsenseInference:
 
         if extract_heads:
             if text:
-                print("Extracting heads...")
+                if doc is None:
+                    doc = self.nlp(text)
                 for head_proc in self._head_processors.values():
-                    extracted_heads = head_proc.extract(text)
+                    extracted_heads = head_proc.extract(text, doc=doc)
                     for head in extracted_heads:
                         head_text = head.text.strip().lower()
                         # Check for duplication
@@ -134,8 +345,18 @@ class CommonsenseInference:
                 head_texts.add(text)
                 kg_heads.append(KnowledgeHead(text=text))
 
+        return kg_heads
+
+    def _build_knowledge(
+        self,
+        kg_heads: List[KnowledgeHead],
+        match_relations: bool = True,
+        relations: Optional[List[KnowledgeRelation]] = None,
+        sample_graph: Optional[KnowledgeGraph] = None,
+    ) -> List[Knowledge]:
+        head_relations = set()
+
         if match_relations:
-            print("Matching relations...")
             for relation_proc in self._relation_processors.values():
                 head_relations = head_relations.union(
                     set(
@@ -160,23 +381,7 @@ class CommonsenseInference:
             head, relation = head_relation
             kg_list.append(Knowledge(head=head, relation=relation))
 
-        input_graph = KnowledgeGraph(kg_list)
-
-        if sample_graph:
-            input_graph = input_graph + sample_graph
-        else:
-            if isinstance(model, GPT3Zeroshot):
-                warnings.warn(
-                    "Sample graph is recommended for good performance with GPT-3 based inference"
-                )
-
-        if dry_run or not model:
-            return input_graph
-
-        print("Generating commonsense graph...")
-        output_graph = model.generate(input_graph, **model_args)
-
-        return output_graph
+        return kg_list
 
     def add_processor(
         self, processor: Union[KnowledgeHeadExtractor, KnowledgeRelationMatcher]
@@ -208,3 +413,9 @@ class CommonsenseInference:
             del self._head_processors[processor_name]
         elif processor_name in self._relation_processors:
             del self._relation_processors[processor_name]
+
+
+def _print_throughput(throughput: List[Tuple[str, int, float]]) -> None:
+    for stage, count, elapsed in throughput:
+        rate = count / elapsed if elapsed > 0 else float("inf")
+        print(f"{stage}: {count} items in {elapsed:.2f}s ({rate:.1f} items/s)")
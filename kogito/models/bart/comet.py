@@ -1,5 +1,6 @@
 import glob
 import os
+from typing import Optional
 from pathlib import Path
 from dataclasses import asdict
 from tqdm import tqdm
@@ -13,7 +14,7 @@ from kogito.core.relation import KG_RELATIONS
 from kogito.core.utils import (
     pickle_save,
     chunks,
-    trim_batch,
+    length_bucketed_batches,
 )
 from kogito.core.callbacks import Seq2SeqLoggingCallback, get_checkpoint_callback
 from kogito.core.model import KnowledgeModel
@@ -138,6 +139,7 @@ class COMETBART(KnowledgeModel):
         batch_size: int = 64,
         max_length: int = 24,
         min_length: int = 1,
+        max_tokens: Optional[int] = None,
     ) -> KnowledgeGraph:
         """Generate inferences from the model
 
@@ -148,26 +150,43 @@ class COMETBART(KnowledgeModel):
             batch_size (int, optional): Batch size to use. Defaults to 64.
             max_length (int, optional): Maximum output length. Defaults to 24.
             min_length (int, optional): Minimum output length. Defaults to 1.
+            max_tokens (Optional[int], optional): Maximum number of (padded) query tokens per batch.
+                Queries are sorted by length and batched under both batch_size and this budget.
+                Defaults to None.
 
         Returns:
             KnowledgeGraph: Complete knowledge graph
         """
+        input_kgs = list(input_graph)
+        queries = [
+            kg_input.to_query(decode_method=decode_method) for kg_input in input_kgs
+        ]
+        query_lengths = (
+            [
+                len(input_ids)
+                for input_ids in self.tokenizer(queries, truncation=True)["input_ids"]
+            ]
+            if queries
+            else []
+        )
+        outputs = [None] * len(input_kgs)
+
         with torch.no_grad():
-            outputs = []
-            for kg_batch in tqdm(list(chunks(input_graph, batch_size))):
-                queries = []
-                for kg_input in kg_batch:
-                    queries.append(kg_input.to_query(decode_method=decode_method))
-                batch = self.tokenizer(
-                    queries, return_tensors="pt", truncation=True, padding="max_length"
-                ).to(device)
-                input_ids, attention_mask = trim_batch(
-                    **batch, pad_token_id=self.tokenizer.pad_token_id
+            for batch in tqdm(
+                length_bucketed_batches(
+                    query_lengths, batch_size=batch_size, max_tokens=max_tokens
                 )
+            ):
+                inputs = self.tokenizer(
+                    [queries[idx] for idx in batch],
+                    return_tensors="pt",
+                    truncation=True,
+                    padding="longest",
+                ).to(device)
 
                 summaries = self.model.generate(
-                    input_ids=input_ids,
-                    attention_mask=attention_mask,
+                    input_ids=inputs["input_ids"],
+                    attention_mask=inputs["attention_mask"],
                     decoder_start_token_id=self.config.decoder_start_token_id,
                     num_beams=num_generate,
                     num_return_sequences=num_generate,
@@ -181,14 +200,12 @@ class COMETBART(KnowledgeModel):
                     clean_up_tokenization_spaces=False,
                 )
 
-                for kg_input, generations in zip(
-                    kg_batch, list(chunks(output, num_generate))
-                ):
-                    output_kg = kg_input.copy()
+                for idx, generations in zip(batch, chunks(output, num_generate)):
+                    output_kg = input_kgs[idx].copy()
                     output_kg.tails = generations
-                    outputs.append(output_kg)
+                    outputs[idx] = output_kg
 
-            return KnowledgeGraph(outputs)
+        return KnowledgeGraph(outputs)
 
     @classmethod
     def from_pretrained(
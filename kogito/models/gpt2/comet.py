@@ -7,11 +7,12 @@ from transformers import GPT2LMHeadModel, GPT2Tokenizer
 from pytorch_lightning.loggers import WandbLogger
 import pytorch_lightning as pl
 
-from kogito.models.gpt2.utils import GPT2Finetuner
+from kogito.models.gpt2.utils import GPT2Finetuner, left_pad
 from kogito.core.dataset import KnowledgeDataset
 from kogito.core.model import KnowledgeModel
 from kogito.core.knowledge import KnowledgeGraph, GEN_TOKEN, EOS_TOKEN, PAD_TOKEN
 from kogito.core.relation import KG_RELATIONS
+from kogito.core.utils import length_bucketed_batches
 
 device = "cuda" if cuda.is_available() else "cpu"
 
@@ -139,6 +140,8 @@ class COMETGPT2(KnowledgeModel):
         repetition_penalty: float = 1.0,
         num_beams: int = 10,
         num_return_sequences: int = 10,
+        batch_size: int = 16,
+        max_tokens: Optional[int] = None,
     ) -> KnowledgeGraph:
         """Generate inferences from knowledge model
 
@@ -153,50 +156,70 @@ class COMETGPT2(KnowledgeModel):
             repetition_penalty (float, optional): GPT-2 repetition_penalty parameter. Defaults to 1.0.
             num_beams (int, optional): GPT-2 num_beams parameter. Defaults to 10.
             num_return_sequences (int, optional): GPT-2 num_return_sequences parameter. Defaults to 10.
+            batch_size (int, optional): Maximum number of inputs to generate at once. Defaults to 16.
+            max_tokens (Optional[int], optional): Maximum number of (padded) input tokens per batch.
+                Defaults to None.
 
         Returns:
             KnowledgeGraph: Completed knowledge graph
         """
-        params = {"batch_size": 1, "shuffle": False, "num_workers": 0}
-        dataset = KnowledgeDataset(
-            input_graph,
-            tokenizer=self.tokenizer,
-            source_len=in_len,
-            target_len=out_len - in_len,
-            is_eval=True,
+        input_kgs = list(input_graph)
+        queries = [
+            " ".join(f"{kg.head} {kg.relation} {GEN_TOKEN}".split()) for kg in input_kgs
+        ]
+        encodings = self.tokenizer(queries, max_length=in_len, truncation=True)
+        batches = length_bucketed_batches(
+            [len(ids) for ids in encodings["input_ids"]],
+            batch_size=batch_size,
+            max_tokens=max_tokens,
+        )
+        num_sequences = num_return_sequences if top_k > 1 else 1
+        pad_token_id = (
+            self.tokenizer.pad_token_id
+            if self.tokenizer.pad_token_id is not None
+            else self.tokenizer.eos_token_id
         )
-        loader = DataLoader(dataset, **params, drop_last=False)
 
         self.model.eval()
 
-        outputs = []
+        outputs = [None] * len(input_kgs)
 
         with torch.no_grad():
-            for input_kg, data in zip(input_graph, loader):
-                ids = data["source_ids"].to(device)
-                mask = data["source_mask"].to(device)
+            for batch in batches:
+                ids, mask = left_pad(
+                    [encodings["input_ids"][idx] for idx in batch], pad_token_id
+                )
+                ids = ids.to(device)
+                mask = mask.to(device)
 
                 generated_ids = self.model.generate(
                     input_ids=ids,
                     attention_mask=mask,
                     temperature=temperature,
                     do_sample=False,
-                    max_length=max_length,
+                    max_length=ids.size(1) + max_length - in_len,
                     top_p=top_p,
                     top_k=top_k,
                     repetition_penalty=repetition_penalty,
-                    num_return_sequences=num_return_sequences if top_k > 1 else 1,
+                    num_return_sequences=num_sequences,
                     num_beams=num_beams,
+                    pad_token_id=pad_token_id,
                 )
 
-                generations = [
-                    self.tokenizer.decode(g, clean_up_tokenization_spaces=True)
-                    for g in generated_ids
-                ]
-
-                output_kg = input_kg.copy()
-                output_kg.tails = generations
-                outputs.append(output_kg)
+                pad_lens = (mask == 0).sum(dim=1).tolist()
+
+                for batch_idx, idx in enumerate(batch):
+                    generations = [
+                        self.tokenizer.decode(
+                            g[pad_lens[batch_idx] :], clean_up_tokenization_spaces=True
+                        )
+                        for g in generated_ids[
+                            batch_idx * num_sequences : (batch_idx + 1) * num_sequences
+                        ]
+                    ]
+                    output_kg = input_kgs[idx].copy()
+                    output_kg.tails = generations
+                    outputs[idx] = output_kg
 
         return KnowledgeGraph(outputs)
 
@@ -1,5 +1,37 @@
+from typing import List, Tuple
 import torch
 import pytorch_lightning as pl
+from transformers import (
+    LogitsProcessor,
+    LogitsProcessorList,
+    TemperatureLogitsWarper,
+    TopKLogitsWarper,
+    TopPLogitsWarper,
+)
+
+
+def left_pad(
+    sequences: List[List[int]], pad_token_id: int
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Left pad token id sequences for batched decoder-only generation
+
+    Args:
+        sequences (List[List[int]]): Token id sequences
+        pad_token_id (int): Padding token id
+
+    Returns:
+        Tuple[torch.Tensor, torch.Tensor]: Padded input ids and attention mask
+    """
+    max_len = max(len(seq) for seq in sequences)
+    input_ids = torch.full((len(sequences), max_len), pad_token_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(sequences), max_len), dtype=torch.long)
+
+    for idx, seq in enumerate(sequences):
+        if seq:
+            input_ids[idx, -len(seq) :] = torch.tensor(seq, dtype=torch.long)
+            attention_mask[idx, -len(seq) :] = 1
+
+    return input_ids, attention_mask
 
 
 class GPT2Finetuner(pl.LightningModule):
@@ -32,3 +64,50 @@ class GPT2Finetuner(pl.LightningModule):
     def configure_optimizers(self):
         optimizer = torch.optim.Adam(self.parameters(), lr=self.learning_rate)
         return optimizer
+
+
+class PerItemSampler(LogitsProcessor):
+    """Samples next tokens with a separate random generator for every input item.
+    Rows of all sequences of an item are drawn from the item's own generator, so sampled
+    generations do not depend on which other items share the batch. The chosen token is
+    returned as the only finite score, which makes the sampling step in ``generate`` a no-op.
+    """
+
+    def __init__(
+        self,
+        seeds: List[int],
+        num_sequences: int = 1,
+        temperature: float = 1.0,
+        top_k: int = 0,
+        top_p: float = 1.0,
+        device: str = "cpu",
+    ) -> None:
+        self.num_sequences = num_sequences
+        self.generators = [
+            torch.Generator(device=device).manual_seed(seed) for seed in seeds
+        ]
+        self.warpers = LogitsProcessorList()
+        if temperature is not None and temperature != 1.0:
+            self.warpers.append(TemperatureLogitsWarper(temperature))
+        if top_k is not None and top_k != 0:
+            self.warpers.append(TopKLogitsWarper(top_k=top_k, min_tokens_to_keep=1))
+        if top_p is not None and top_p < 1.0:
+            self.warpers.append(TopPLogitsWarper(top_p=top_p, min_tokens_to_keep=1))
+
+    def __call__(
+        self, input_ids: torch.LongTensor, scores: torch.FloatTensor
+    ) -> torch.FloatTensor:
+        scores = self.warpers(input_ids, scores)
+        probs = torch.softmax(scores, dim=-1)
+        next_tokens = torch.cat(
+            [
+                torch.multinomial(
+                    probs[idx * self.num_sequences : (idx + 1) * self.num_sequences],
+                    num_samples=1,
+                    generator=generator,
+                )
+                for idx, generator in enumerate(self.generators)
+            ]
+        )
+        next_scores = torch.full_like(scores, -float("inf"))
+        return next_scores.scatter_(1, next_tokens, 0.0)
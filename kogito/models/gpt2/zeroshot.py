@@ -1,9 +1,10 @@
 import numpy as np
 import torch
 from torch import cuda
-from transformers import GPT2Tokenizer, GPT2LMHeadModel
+from transformers import GPT2Tokenizer, GPT2LMHeadModel, LogitsProcessorList
 
-from kogito.core.utils import find_nth
+from kogito.core.utils import find_nth, length_bucketed_batches
+from kogito.models.gpt2.utils import left_pad, PerItemSampler
 from kogito.core.model import KnowledgeModel
 from kogito.core.knowledge import KnowledgeGraph
 
@@ -45,6 +46,7 @@ class GPT2Zeroshot(KnowledgeModel):
         stop_token: str = ".",
         temperature: float = 1.0,
         repetition_penalty: float = 1.0,
+        batch_size: int = 1,
     ) -> KnowledgeGraph:
         """Generate inferences from GPT2 model
 
@@ -58,6 +60,11 @@ class GPT2Zeroshot(KnowledgeModel):
             stop_token (str, optional): Stop token. Defaults to ".".
             temperature (float, optional): GPT-2 temperature parameter. Defaults to 1.0.
             repetition_penalty (float, optional): GPT-2 repetition_penalty parameter. Defaults to 1.0.
+            batch_size (int, optional): Number of prompts to generate at once. Prompts are grouped by token length
+                and left padded. Without beam search (``num_beams=1``), every prompt is sampled with its own generator
+                seeded by ``seed`` and its position in the input graph, so results do not depend on the batch
+                composition. With beam search, beams are sampled with the global generator seeded by ``seed``,
+                so results can depend on how prompts are batched. Defaults to 1.
 
         Returns:
             KnowledgeGraph: Completed knowledge graph
@@ -66,6 +73,20 @@ class GPT2Zeroshot(KnowledgeModel):
         np.random.seed(seed)
         torch.backends.cudnn.deterministic = True
 
+        if batch_size > 1:
+            return self._generate_batch(
+                input_graph,
+                seed=seed,
+                top_k=top_k,
+                top_p=top_p,
+                num_sequences=num_sequences,
+                num_beams=num_beams,
+                stop_token=stop_token,
+                temperature=temperature,
+                repetition_penalty=repetition_penalty,
+                batch_size=batch_size,
+            )
+
         outputs = []
         for input_kg in input_graph:
             prompt = input_kg.to_prompt()
@@ -103,3 +124,90 @@ class GPT2Zeroshot(KnowledgeModel):
             outputs.append(output_kg)
 
         return KnowledgeGraph(outputs)
+
+    def _generate_batch(
+        self,
+        input_graph: KnowledgeGraph,
+        seed: int = 42,
+        top_k: int = 1,
+        top_p: float = 0.9,
+        num_sequences: int = 10,
+        num_beams: int = 1,
+        stop_token: str = ".",
+        temperature: float = 1.0,
+        repetition_penalty: float = 1.0,
+        batch_size: int = 16,
+    ) -> KnowledgeGraph:
+        input_kgs = list(input_graph)
+        prompts = [input_kg.to_prompt() for input_kg in input_kgs]
+        encodings = [
+            self.tokenizer.encode(prompt, add_special_tokens=False)
+            for prompt in prompts
+        ]
+        pad_token_id = (
+            self.tokenizer.pad_token_id
+            if self.tokenizer.pad_token_id is not None
+            else self.tokenizer.eos_token_id
+        )
+        outputs = [None] * len(input_kgs)
+
+        for batch in length_bucketed_batches(
+            [len(ids) for ids in encodings], batch_size=batch_size
+        ):
+            input_ids, attention_mask = left_pad(
+                [encodings[idx] for idx in batch], pad_token_id
+            )
+            if num_beams == 1:
+                sampler = PerItemSampler(
+                    [seed + idx for idx in batch],
+                    num_sequences=num_sequences,
+                    temperature=temperature,
+                    top_k=top_k,
+                    top_p=top_p,
+                    device=device,
+                )
+                # Sampling parameters are applied by the per-item sampler
+                sampling_kwargs = dict(
+                    temperature=1.0,
+                    top_k=0,
+                    top_p=1.0,
+                    logits_processor=LogitsProcessorList([sampler]),
+                )
+            else:
+                sampling_kwargs = dict(
+                    temperature=temperature, top_k=top_k, top_p=top_p
+                )
+
+            generations = self.model.generate(
+                input_ids=input_ids.to(device),
+                attention_mask=attention_mask.to(device),
+                max_length=input_ids.size(1) + 10,
+                repetition_penalty=repetition_penalty,
+                do_sample=True,
+                num_return_sequences=num_sequences,
+                num_beams=num_beams,
+                pad_token_id=pad_token_id,
+                **sampling_kwargs,
+            )
+
+            pad_lens = (attention_mask == 0).sum(dim=1).tolist()
+            texts = self.tokenizer.batch_decode(
+                [
+                    gen[pad_lens[row // num_sequences] :].tolist()
+                    for row, gen in enumerate(generations)
+                ],
+                clean_up_tokenization_spaces=True,
+            )
+
+            for batch_idx, idx in enumerate(batch):
+                nth = 2 if stop_token in prompts[idx] else 1
+                output_kg = input_kgs[idx].copy()
+                output_kg.tails = [
+                    text[: find_nth(text, stop_token, nth)]
+                    for text in texts[
+                        batch_idx * num_sequences : (batch_idx + 1) * num_sequences
+                    ]
+                ]
+                outputs[idx] = output_kg
+
+        return KnowledgeGraph(outputs)
@@ -0,0 +1,171 @@
+from typing import Callable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import asyncio
+import random
+import time
+
+import openai
+
+RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.APIError,
+    openai.error.APIConnectionError,
+    openai.error.ServiceUnavailableError,
+)
+
+
+class TokenBucket:
+    """Asynchronous token bucket rate limiter"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """Initialize a token bucket
+
+        Args:
+            rate (float): Number of tokens added per second.
+            capacity (Optional[float], optional): Maximum number of tokens in the bucket.
+                Defaults to max(1, rate).
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class GPT3RequestEngine:
+    """Concurrent, rate-limited request engine for GPT-3 completions"""
+
+    def __init__(
+        self,
+        prompts_per_request: int = 20,
+        max_concurrency: int = 4,
+        requests_per_minute: Optional[float] = 60,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ) -> None:
+        """Initialize a request engine
+
+        Args:
+            prompts_per_request (int, optional): Maximum number of prompts to send in a single request.
+                Defaults to 20.
+            max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 4.
+            requests_per_minute (Optional[float], optional): Maximum request rate. If None, requests are
+                not rate limited. Defaults to 60.
+            max_retries (int, optional): Number of retries for a failed request. Defaults to 5.
+            backoff (float, optional): Base delay in seconds for exponential backoff. Defaults to 1.0.
+            max_backoff (float, optional): Maximum delay in seconds between retries. Defaults to 60.0.
+        """
+        self.prompts_per_request = prompts_per_request
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def complete(
+        self, complete_fn: Callable, prompts: List[str], n: int = 1, **kwargs
+    ) -> List[List[str]]:
+        """Complete prompts with batched, concurrent and rate-limited requests
+
+        Args:
+            complete_fn (Callable): Function to send a single completion request.
+                It is called with ``prompt``, ``n`` and the given keyword arguments and should return
+                a completion response.
+            prompts (List[str]): Prompts to complete.
+            n (int, optional): Number of completions per prompt. Defaults to 1.
+
+        Returns:
+            List[List[str]]: Completion texts for each prompt in the same order
+        """
+        coroutine = self.acomplete(complete_fn, prompts, n=n, **kwargs)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+
+        # An event loop is already running (e.g. in a notebook), run in a separate thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    async def acomplete(
+        self, complete_fn: Callable, prompts: List[str], n: int = 1, **kwargs
+    ) -> List[List[str]]:
+        """Asynchronous version of ``complete``"""
+        results: List[List[str]] = [[] for _ in prompts]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        bucket = (
+            TokenBucket(self.requests_per_minute / 60.0)
+            if self.requests_per_minute
+            else None
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            await asyncio.gather(
+                *[
+                    self._complete_chunk(
+                        partial(complete_fn, n=n, **kwargs),
+                        prompts,
+                        start,
+                        results,
+                        n=n,
+                        semaphore=semaphore,
+                        bucket=bucket,
+                        executor=executor,
+                    )
+                    for start in range(0, len(prompts), self.prompts_per_request)
+                ]
+            )
+
+        return results
+
+    async def _complete_chunk(
+        self,
+        complete_fn: Callable,
+        prompts: List[str],
+        start: int,
+        results: List[List[str]],
+        n: int,
+        semaphore: asyncio.Semaphore,
+        bucket: Optional[TokenBucket],
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        chunk = prompts[start : start + self.prompts_per_request]
+        loop = asyncio.get_running_loop()
+
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                if bucket:
+                    await bucket.acquire()
+                try:
+                    response = await loop.run_in_executor(
+                        executor, partial(complete_fn, prompt=chunk)
+                    )
+                    break
+                except RETRYABLE_ERRORS:
+                    if attempt == self.max_retries:
+                        raise
+                    # Exponential backoff with full jitter
+                    delay = min(self.max_backoff, self.backoff * 2**attempt)
+                    await asyncio.sleep(random.uniform(0, delay))
+
+        for choice in sorted(response.choices, key=lambda choice: choice["index"]):
+            results[start + choice["index"] // n].append(choice["text"])
@@ -0,0 +1,137 @@
+from typing import Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+import threading
+import time
+
+COMPLETIONS_PATH = re.compile(r"^/v1(/engines/(?P<engine>[^/]+))?/completions$")
+
+
+class FakeCompletionServer:
+    """Local HTTP server mimicking the GPT-3 completions API for offline tests and benchmarks.
+    Point the model to it with ``GPT3Zeroshot(api_key=..., api_base=server.url)``.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        fail_every: Optional[int] = None,
+        text: str = " fake completion",
+    ) -> None:
+        """Initialize a fake completion server
+
+        Args:
+            host (str, optional): Host to bind to. Defaults to "127.0.0.1".
+            port (int, optional): Port to bind to. If 0, a free port is picked. Defaults to 0.
+            latency (float, optional): Seconds to wait before answering a request. Defaults to 0.0.
+            fail_every (Optional[int], optional): Answer every n-th request with a rate limit error
+                to exercise retries. Defaults to None.
+            text (str, optional): Completion text to return. Defaults to " fake completion".
+        """
+        self.latency = latency
+        self.fail_every = fail_every
+        self.text = text
+        self.num_requests = 0
+        self.num_prompts = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as ``api_base``"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeCompletionServer":
+        """Start serving in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeCompletionServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                match = COMPLETIONS_PATH.match(self.path)
+
+                if not match:
+                    return self._respond(404, {"error": {"message": "Not found"}})
+
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+                with server._lock:
+                    server.num_requests += 1
+                    num_requests = server.num_requests
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if server.fail_every and num_requests % server.fail_every == 0:
+                    return self._respond(
+                        429,
+                        {
+                            "error": {
+                                "message": "Rate limit reached",
+                                "type": "requests",
+                            }
+                        },
+                    )
+
+                prompts = body.get("prompt", "")
+                prompts = [prompts] if isinstance(prompts, str) else prompts
+                n = body.get("n", 1)
+
+                with server._lock:
+                    server.num_prompts += len(prompts)
+
+                choices = [
+                    {
+                        "text": f"{server.text} {index}",
+                        "index": index,
+                        "logprobs": None,
+                        "finish_reason": "length",
+                    }
+                    for index in range(len(prompts) * n)
+                ]
+
+                self._respond(
+                    200,
+                    {
+                        "id": f"cmpl-{num_requests}",
+                        "object": "text_completion",
+                        "created": int(time.time()),
+                        "model": match.group("engine") or body.get("model"),
+                        "choices": choices,
+                    },
+                )
+
+            def _respond(self, status, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
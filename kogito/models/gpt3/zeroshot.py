@@ -1,23 +1,36 @@
 from typing import Optional
+from functools import partial
 import openai
 
 from kogito.core.model import KnowledgeModel
 from kogito.core.knowledge import KnowledgeGraph
 from kogito.core.utils import get_uuid
+from kogito.models.gpt3.engine import GPT3RequestEngine
 
 
 class GPT3Zeroshot(KnowledgeModel):
     """Zeroshot knowledge model based on GPT-3"""
 
-    def __init__(self, api_key: str, model_name: str = "text-davinci-002") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "text-davinci-002",
+        api_base: Optional[str] = None,
+        engine: Optional[GPT3RequestEngine] = None,
+    ) -> None:
         """Initialize a GPT-3 model
 
         Args:
             api_key (str): OpenAI API Key for GPT-3 model
             model_name (str, optional): Type of GPT-3 model. Defaults to "text-davinci-002".
+            api_base (Optional[str], optional): Base URL of the API, e.g. of a local stub server. Defaults to None.
+            engine (Optional[GPT3RequestEngine], optional): Request engine controlling batching, concurrency,
+                rate limiting and retries. Defaults to None (engine with default settings).
         """
         self.api_key = api_key
         self.model_name = model_name
+        self.api_base = api_base
+        self.engine = engine or GPT3RequestEngine()
 
     def train(self):
         raise ValueError("GPT-3 Zeroshot model is not trainable")
@@ -60,7 +73,6 @@ class GPT3Zeroshot(KnowledgeModel):
             KnowledgeGraph: Completed knowledge graph
         """
         rel_kg_map = {}
-        outputs = []
 
         for input_kg in input_graph:
             if input_kg.relation not in rel_kg_map:
@@ -70,12 +82,14 @@ class GPT3Zeroshot(KnowledgeModel):
             else:
                 rel_kg_map[input_kg.relation]["targets"].append(input_kg)
 
+        prompts = []
+        outputs = []
+
         for relation, kg_map in rel_kg_map.items():
             samples = kg_map["samples"][:num_samples]
             targets = kg_map["targets"]
 
             if targets:
-                prompts = []
                 sample_prompts = []
 
                 for index, sample_kg in enumerate(samples):
@@ -93,29 +107,28 @@ class GPT3Zeroshot(KnowledgeModel):
                     if include_task_prompt and relation.prompt:
                         final_prompt = f"{relation.prompt}\n\n{final_prompt}"
                     prompts.append(final_prompt)
+                    outputs.append(target.copy())
+
+        # Prompts of all relations are sent together in batched, concurrent requests
+        completions = self.engine.complete(
+            partial(
+                complete_gpt3,
+                api_key=self.api_key,
+                model_name=self.model_name,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                logprobs=logprobs,
+                stop=stop,
+                debug=debug,
+                api_base=self.api_base,
+            ),
+            prompts,
+            n=n,
+        )
 
-                response = complete_gpt3(
-                    api_key=self.api_key,
-                    model_name=self.model_name,
-                    prompt=prompts,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    top_p=top_p,
-                    logprobs=logprobs,
-                    n=n,
-                    stop=stop,
-                    debug=debug,
-                )
-
-                rel_outputs = []
-                for target in targets:
-                    rel_outputs.append(target.copy())
-
-                for result in response.choices:
-                    output_kg = rel_outputs[result["index"] // n]
-                    output_kg.tails.append(result["text"])
-
-                outputs.extend(rel_outputs)
+        for output_kg, texts in zip(outputs, completions):
+            output_kg.tails.extend(texts)
 
         return KnowledgeGraph(outputs)
 
@@ -131,6 +144,7 @@ def complete_gpt3(
     n=1,
     stop=None,
     debug=False,
+    api_base=None,
 ):
     response = None
     openai.api_key = api_key
@@ -150,6 +164,7 @@ def complete_gpt3(
             echo=False,
             stop=stop,
             n=n,
+            api_base=api_base,
         )
     except Exception as e:
         print("Something went wrong when querying GPT-3 API")
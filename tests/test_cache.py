@@ -0,0 +1,63 @@
+from kogito.core.cache import CachedKnowledgeModel, GenerationCache
+from kogito.core.head import KnowledgeHead
+from kogito.core.knowledge import Knowledge, KnowledgeGraph
+from kogito.core.model import KnowledgeModel
+from kogito.core.relation import X_NEED, X_WANT
+
+
+class EchoModel(KnowledgeModel):
+    """Model generating one tail per input, including samples"""
+
+    model_name = "echo"
+
+    def __init__(self):
+        self.calls = 0
+
+    def train(self, *args, **kwargs):
+        return self
+
+    def save_pretrained(self, save_path):
+        pass
+
+    @classmethod
+    def from_pretrained(cls, model_name_or_path):
+        return cls()
+
+    def generate(self, input_graph, **kwargs):
+        self.calls += 1
+        outputs = []
+        for kg in input_graph:
+            output_kg = kg.copy()
+            output_kg.tails = [
+                f"{kg.head} {kg.relation} {'sample' if kg.tails else 'generated'}"
+            ]
+            outputs.append(output_kg)
+        return KnowledgeGraph(outputs)
+
+
+def _to_tuples(graph):
+    return [(str(kg.head), str(kg.relation), tuple(kg.tails)) for kg in graph]
+
+
+def test_warm_cache_returns_same_graph_as_cold_cache(tmp_path):
+    input_graph = KnowledgeGraph(
+        [
+            Knowledge(head=KnowledgeHead("a dog"), relation=X_NEED, tails=["food"]),
+            Knowledge(head=KnowledgeHead("a dog"), relation=X_NEED),
+            Knowledge(head=KnowledgeHead("a dog"), relation=X_WANT),
+        ]
+    )
+    model = EchoModel()
+    cached_model = CachedKnowledgeModel(
+        model, GenerationCache(str(tmp_path / "cache.sqlite"))
+    )
+
+    cold_graph = cached_model.generate(input_graph)
+    warm_graph = cached_model.generate(input_graph)
+
+    assert model.calls == 1
+    assert _to_tuples(warm_graph) == _to_tuples(cold_graph)
+    assert _to_tuples(cold_graph) == [
+        ("a dog", "xNeed", ("a dog xNeed generated",)),
+        ("a dog", "xWant", ("a dog xWant generated",)),
+    ]
@@ -0,0 +1,31 @@
+import numpy as np
+
+from kogito.evaluation.cider.cider import Cider
+
+
+def cider_scores(gts, res):
+    legacy = Cider(vectorized=False).compute_score(gts, res)
+    vectorized = Cider(vectorized=True).compute_score(gts, res)
+    return legacy, vectorized
+
+
+def test_vectorized_cider_matches_legacy_cider():
+    gts = {
+        "0": ["to get a job", "to earn money"],
+        "1": ["happy", "relieved and happy"],
+        "2": ["go to the store"],
+    }
+    res = {"0": ["to get money"], "1": ["happy"], "2": ["buy food at the store"]}
+    (legacy_score, legacy_scores), (score, scores) = cider_scores(gts, res)
+
+    assert np.isclose(score, legacy_score, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(scores, legacy_scores, rtol=0, atol=1e-12)
+
+
+def test_vectorized_cider_without_matching_ngrams():
+    gts = {"0": ["a b c"], "1": ["d e f"]}
+    res = {"0": ["x y"], "1": ["z w"]}
+    (legacy_score, legacy_scores), (score, scores) = cider_scores(gts, res)
+
+    assert score == legacy_score == 0.0
+    np.testing.assert_array_equal(scores, legacy_scores)
@@ -0,0 +1,36 @@
+import multiprocessing
+
+import pytest
+
+from kogito.evaluation.eval import Evaluator
+from kogito.evaluation.meteor import meteor
+
+
+class EmptyWordNet:
+    """WordNet reader without synonyms, so that the test does not need the NLTK corpora"""
+
+    def synsets(self, lemma):
+        return []
+
+
+@pytest.fixture
+def offline_meteor(monkeypatch):
+    # worker processes inherit the patched module when they are forked
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("patched tokenizer is only inherited by forked workers")
+
+    monkeypatch.setattr(meteor, "word_tokenize", str.split)
+    monkeypatch.setattr(meteor, "_wordnet", meteor.CachedWordNet(EmptyWordNet()))
+
+
+def test_sharded_meteor_matches_serial_meteor(offline_meteor):
+    references = [["to get a job", "to earn money"], ["happy"], ["to go home"]]
+    candidates = ["to get money", "very happy", "to go to the store", "happy"]
+    gts = {str(i): references[i % len(references)] for i in range(len(candidates))}
+    res = {str(i): [candidate] for i, candidate in enumerate(candidates)}
+
+    serial = Evaluator(gts, res, ["meteor"])
+    sharded = Evaluator(gts, res, ["meteor"], workers=2, shard=True)
+
+    assert sharded.evaluate() == serial.evaluate()
+    assert sharded.results["meteor"][1] == serial.results["meteor"][1]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from kogito.core.processors.relation import (
+    ModelBasedRelationMatcher,
+    relation_matcher_parity,
+)
+
+HEADS = ["get a job", "a dog", "go home"]
+PROBS = np.array([[0.1, 0.9, 0.7], [0.8, 0.2, 0.1], [0.3, 0.4, 0.2]], dtype=np.float32)
+
+
+class FixedRelationMatcher(ModelBasedRelationMatcher):
+    """Relation matcher returning fixed class probabilities"""
+
+    def __init__(self, name, probs, **kwargs):
+        super().__init__(
+            name, dataset_class=None, model_class=None, model_path=None, **kwargs
+        )
+        self.probs = probs
+
+    def predict(self, data):
+        return self.probs[: len(data)]
+
+
+def test_parity_of_identical_matchers():
+    reference = FixedRelationMatcher("reference", PROBS)
+    candidate = FixedRelationMatcher("candidate", PROBS.copy())
+
+    assert relation_matcher_parity(reference, candidate, HEADS) == {
+        "max_abs_diff": 0.0,
+        "class_agreement": 1.0,
+        "decision_agreement": 1.0,
+    }
+
+
+def test_parity_of_diverging_matchers():
+    reference = FixedRelationMatcher("reference", PROBS)
+    # small drift keeps decisions, the last head flips its most probable class
+    probs = PROBS + np.array([[0.01, -0.01, 0.0], [0.0, 0.0, 0.0], [0.2, 0.0, 0.0]])
+    candidate = FixedRelationMatcher("candidate", probs.astype(np.float32))
+    parity = relation_matcher_parity(reference, candidate, HEADS)
+
+    assert parity["max_abs_diff"] == pytest.approx(0.2)
+    assert parity["class_agreement"] == pytest.approx(2 / 3)
+    assert parity["decision_agreement"] == pytest.approx(7 / 9)
+
+
+def test_parity_without_heads():
+    reference = FixedRelationMatcher("reference", PROBS)
+    candidate = FixedRelationMatcher("candidate", PROBS)
+
+    assert relation_matcher_parity(reference, candidate, [])["class_agreement"] == 1.0
+
+
+def test_onnx_requires_transformer_matcher():
+    with pytest.raises(ValueError):
+        FixedRelationMatcher("onnx", PROBS, onnx_path="classifier.onnx")
+
+    with pytest.raises(ValueError):
+        FixedRelationMatcher("reference", PROBS).export_onnx("classifier.onnx")